@@ -1,17 +1,26 @@
 import argparse
+from pathlib import Path
 from typing import NamedTuple
 
 from tic_tac_toe.game.players import (
     Player,
-    MinimaxComputerPlayer
+    MctsComputerPlayer,
+    MinimaxComputerPlayer,
+    RandomComputerPlayer,
+    SabotageComputerPlayer
 )
-from tic_tac_toe.logic.models import Mark
+from tic_tac_toe.logic.bitboard import SIZE
+from tic_tac_toe.logic.models import Grid, Mark
+from tic_tac_toe.logic.validators import MIN_SIZE
 
 from .players import ConsolePlayer
 
 PLAYER_CLASSES = {
     "human": ConsolePlayer,
-    "minimax": MinimaxComputerPlayer
+    "mcts": MctsComputerPlayer,
+    "minimax": MinimaxComputerPlayer,
+    "random": RandomComputerPlayer,
+    "sabotage": SabotageComputerPlayer
 }
 
 
@@ -19,6 +28,16 @@ class Args(NamedTuple):
     player1: Player
     player2: Player
     starting_mark: Mark
+    # the empty board of the chosen size and win length
+    grid: Grid = Grid()
+    # the number of headless games to play, None for an interactive game
+    selfplay: int | None = None
+    workers: int | None = None
+    seed: int = 0
+    # where to write JSON lines with the timing of every turn
+    timings: Path | None = None
+    # where to write the cProfile stats of the computer players' moves
+    profile: Path | None = None
 
 
 def parse_args() -> Args:
@@ -27,7 +46,7 @@ def parse_args() -> Args:
         "-X",
         dest="player_x",
         choices=PLAYER_CLASSES.keys(),
-        default="human",
+        default=None,
     )
     parser.add_argument(
         "-O",
@@ -42,12 +61,87 @@ def parse_args() -> Args:
         type=Mark,
         default="X",
     )
+    parser.add_argument(
+        "--size",
+        metavar="N",
+        type=int,
+        default=SIZE,
+        help="play on an N by N board",
+    )
+    parser.add_argument(
+        "--win-length",
+        metavar="K",
+        type=int,
+        default=None,
+        help="marks in a row needed to win (the whole side of the board by default)",
+    )
+    parser.add_argument(
+        "--selfplay",
+        metavar="N",
+        type=int,
+        default=None,
+        help="play N computer games without rendering and report the results",
+    )
+    parser.add_argument(
+        "--workers",
+        metavar="K",
+        type=int,
+        default=None,
+        help="processes for --selfplay (one per core by default)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="seed of the random moves in --selfplay",
+    )
+    parser.add_argument(
+        "--ponder",
+        action="store_true",
+        help="let the minimax players search during their opponent's turn",
+    )
+    parser.add_argument(
+        "--timings",
+        metavar="PATH",
+        type=Path,
+        default=None,
+        help="write the timing of every turn as JSON lines",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        type=Path,
+        default=None,
+        help="profile the computer players' moves with cProfile and save the stats",
+    )
     args = parser.parse_args()
 
-    player1 = PLAYER_CLASSES[args.player_x](Mark("X"))
-    player2 = PLAYER_CLASSES[args.player_o](Mark("O"))
+    # a human can't take part in self-play, so X defaults to the computer there
+    if args.player_x is None:
+        args.player_x = "human" if args.selfplay is None else "minimax"
+    if args.selfplay is not None and "human" in (args.player_x, args.player_o):
+        parser.error("--selfplay needs computer players for -X and -O")
+    if args.selfplay is not None and (args.timings or args.profile or args.ponder):
+        parser.error("--timings, --profile and --ponder only work for a single game")
+
+    if args.size < MIN_SIZE:
+        parser.error(f"--size must be at least {MIN_SIZE}")
+    try:
+        grid = Grid.empty_board(args.size, args.win_length)
+    except ValueError as ex:
+        parser.error(str(ex))
+
+    player1 = make_player(args.player_x, Mark("X"), args.ponder)
+    player2 = make_player(args.player_o, Mark("O"), args.ponder)
 
     if args.starting_mark == "O":
         player1, player2 = player2, player1
 
-    return Args(player1, player2, args.starting_mark)
+    return Args(player1, player2, args.starting_mark, grid, args.selfplay, args.workers, args.seed, args.timings, args.profile)
+
+
+def make_player(name: str, mark: Mark, ponder: bool) -> Player:
+    player_class = PLAYER_CLASSES[name]
+    if ponder and issubclass(player_class, MinimaxComputerPlayer):
+        return player_class(mark, ponder=True)
+    return player_class(mark)
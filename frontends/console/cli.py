@@ -1,9 +1,47 @@
+import cProfile
+from contextlib import nullcontext
+
 from tic_tac_toe.game.engine import TicTacToe
+from tic_tac_toe.game.hooks import TimingHooks
+from tic_tac_toe.game.players import ComputerPlayer
+from tic_tac_toe.game.selfplay import SelfPlayStats, run_selfplay
+from tic_tac_toe.logic.models import Mark
 
-from .args import parse_args
+from .args import Args, parse_args
+from .players import ConsolePlayer
 from .renderers import ConsoleRenderer
 
 
 def main() -> None:
-    player1, player2, starting_mark = parse_args()
-    TicTacToe(player1, player2, ConsoleRenderer()).play(starting_mark)
+    args = parse_args()
+    if args.selfplay is not None:
+        players = {player.mark: type(player) for player in (args.player1, args.player2)}
+        stats = run_selfplay(args.selfplay, players[Mark.CROSS], players[Mark.NAUGHT], args.workers, args.seed, args.starting_mark, args.grid)
+        print_stats(stats)
+    else:
+        play(args)
+
+# to play one game, optionally timing the turns and profiling the computer
+def play(args: Args) -> None:
+    profile = cProfile.Profile() if args.profile else None
+    for player in (args.player1, args.player2):
+        if isinstance(player, ComputerPlayer):
+            player.profiler = profile
+    with open(args.timings, "w") if args.timings else nullcontext() as timings:
+        hooks = TimingHooks(timings) if timings else None
+        hints = [player.hints for player in (args.player1, args.player2) if isinstance(player, ConsolePlayer)]
+        try:
+            TicTacToe(args.player1, args.player2, ConsoleRenderer(hints), hooks=hooks, grid=args.grid).play(args.starting_mark)
+        finally:
+            # the hint threads are stopped however the game ended
+            for service in hints:
+                service.close()
+    if profile is not None:
+        profile.dump_stats(args.profile)
+
+# to print the results of the self-play games
+def print_stats(stats: SelfPlayStats) -> None:
+    print(f"{stats.games} games in {stats.elapsed_seconds:.2f} s ({stats.games_per_second:.1f} games/s)")
+    print(f"X wins: {stats.wins[Mark.CROSS]}, O wins: {stats.wins[Mark.NAUGHT]}, ties: {stats.ties}")
+    for mark in Mark:
+        print(f"{mark.value} average move: {stats.average_move_seconds(mark) * 1000:.2f} ms over {stats.moves[mark]} moves")
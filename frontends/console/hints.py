@@ -0,0 +1,62 @@
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import NamedTuple
+
+from tic_tac_toe.game.players import SabotageComputerPlayer
+from tic_tac_toe.logic.models import GameState, Mark, Move
+
+
+class Hints(NamedTuple):
+    sabotage: Move | None
+    avoid: Move | None
+
+
+# computes the hints of a position once, in a background thread, so they can
+# be started as soon as the position is on screen
+class HintService:
+    def __init__(self, mark: Mark) -> None:
+        self.mark = mark
+        self.sabotage_player = SabotageComputerPlayer(Mark("O"))
+        # one thread, so the sabotage player is never used by two at once
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hints")
+        self.hints: dict[GameState, Future[Hints]] = {}
+
+    def start_game(self) -> None:
+        for future in self.hints.values():
+            future.cancel()
+        # the table is not cleared under a hint still being searched
+        wait(self.hints.values())
+        self.hints.clear()
+        self.sabotage_player.start_game()
+
+    # for stopping the hint thread, hints still queued are dropped
+    def close(self) -> None:
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.hints.clear()
+
+    def __enter__(self) -> "HintService":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # for starting the hints of a position the player will have to move in,
+    # returns the pending hints
+    def request(self, game_state: GameState) -> Future[Hints] | None:
+        if game_state.game_over or game_state.current_mark is not self.mark:
+            return None
+        if (future := self.hints.get(game_state)) is None:
+            future = self.hints[game_state] = self.executor.submit(self.compute, game_state)
+        return future
+
+    # None when the position has no hints (the game is over or it is the
+    # other player's turn)
+    def get(self, game_state: GameState) -> Hints | None:
+        if (future := self.request(game_state)) is None:
+            return None
+        return future.result()
+
+    def compute(self, game_state: GameState) -> Hints:
+        return Hints(
+            self.sabotage_player.get_worst_move(game_state),
+            self.sabotage_player.get_best_move(game_state),
+        )
@@ -1,23 +1,40 @@
 import re
 from tic_tac_toe.game.players import Player
+from tic_tac_toe.logic.bitboard import SIZE
 from tic_tac_toe.logic.exceptions import InvalidMove
 from tic_tac_toe.logic.models import GameState, Move, Mark
-from tic_tac_toe.game.players import SabotageComputerPlayer
+
+from .hints import Hints, HintService
 
 # class for a human player
 class ConsolePlayer(Player):
     def __init__(self, mark: Mark) -> None:
         super().__init__(mark)
-        self.sabotage_player = SabotageComputerPlayer(Mark("O"))
+        # the hints are searched once per position, in the background
+        self.hints = HintService(mark)
+
+    def start_game(self) -> None:
+        self.hints.start_game()
 
     def get_move(self, game_state: GameState) -> Move | None:
+        pending = self.hints.request(game_state)
+        size = game_state.grid.size
+        if pending is None:
+            pass
+        elif pending.done():
+            print_hints(pending.result(), size)
+        else:
+            print("Hints are on their way, enter ? to see them")
         while not game_state.game_over:
             try:
-                sabotage_move = self.sabotage_player.get_worst_move(game_state)
-                avoid_move = self.sabotage_player.get_best_move(game_state)
-                print(f"To sabotage, take cell: {index_to_grid(sabotage_move.cell_index)} ")
-                print(f"Best to avoid cell: {index_to_grid(avoid_move.cell_index)}")
-                index = grid_to_index(input(f"Player 1's move: ").strip())
+                answer = input(f"Player 1's move: ").strip()
+                if answer == "?":
+                    if hints := self.hints.get(game_state):
+                        print_hints(hints, size)
+                    else:
+                        print("There are no hints for this position")
+                    continue
+                index = grid_to_index(answer, size)
             except ValueError:
                 print("Please provide coordinates in the form of A1 or 1A")
             else:
@@ -27,18 +44,27 @@ class ConsolePlayer(Player):
                     print("That cell is already occupied.")
         return None
     
-# to convert user input to grid mapping
-def grid_to_index(grid: str) -> int:
-    if re.match(r"[abcdABCD][1234]", grid):
-        col, row = grid
-    elif re.match(r"[1234][abcdABCD]", grid):
-        row, col = grid
+# to show where the hints say to move
+def print_hints(hints: Hints, size: int = SIZE) -> None:
+    print(f"To sabotage, take cell: {index_to_grid(hints.sabotage.cell_index, size)} ")
+    print(f"Best to avoid cell: {index_to_grid(hints.avoid.cell_index, size)}")
+
+# to convert user input to grid mapping (columns are letters, rows numbers)
+def grid_to_index(grid: str, size: int = SIZE) -> int:
+    if match := re.match(r"([a-zA-Z])(\d+)", grid):
+        col, row = match.groups()
+    elif match := re.match(r"(\d+)([a-zA-Z])", grid):
+        row, col = match.groups()
     else:
         raise ValueError("Invalid grid coordinates")
-    return 4 * (int(row) - 1) + (ord(col.upper()) - ord("A"))
+    col_index = ord(col.upper()) - ord("A")
+    row_index = int(row) - 1
+    if not (0 <= col_index < size and 0 <= row_index < size):
+        raise ValueError("Invalid grid coordinates")
+    return size * row_index + col_index
 
 # to convert index to grid mapping
-def index_to_grid(index: int) -> str:
-    col = chr((index % 4) + ord("A"))
-    row = str((index // 4) + 1)
+def index_to_grid(index: int, size: int = SIZE) -> str:
+    col = chr((index % size) + ord("A"))
+    row = str((index // size) + 1)
     return col + row
\ No newline at end of file
@@ -1,12 +1,20 @@
-import textwrap
+from math import isqrt
 from typing import Iterable
 
 from tic_tac_toe.game.renderers import Renderer
 from tic_tac_toe.logic.models import GameState, Mark
 
+from .hints import HintService
+
 # to render the game screen
 class ConsoleRenderer(Renderer):
+    def __init__(self, hints: Iterable[HintService] = ()) -> None:
+        self.hints = tuple(hints)
+
     def render(self, game_state: GameState) -> None:
+        # the hints are searched while the player looks at the board
+        for hints in self.hints:
+            hints.request(game_state)
         clear_screen() # clear out the last state
         if game_state.winner:
             print_blinking(game_state.grid.cells, game_state.winning_cells)
@@ -34,20 +42,16 @@ def print_blinking(cells: Iterable[str], positions: Iterable[int]) -> None:
         mutable_cells[position] = blink(mutable_cells[position])
     print_solid(mutable_cells)
 
-# to print the solid board
+# to print the solid board, of any size
 def print_solid(cells: Iterable[str]) -> None:
-    print(
-        textwrap.dedent(
-            """\
-             A   B   C   D
-           -----------------
-        1 ┆  {0} │ {1} │ {2} │ {3}
-          ┆ ───┼───┼───┼───
-        2 ┆  {4} │ {5} │ {6} │ {7}
-          ┆ ───┼───┼───┼───
-        3 ┆  {8} │ {9} │ {10} │ {11}
-          ┆ ───┼───┼───┼───
-        4 ┆  {12} │ {13} │ {14} │ {15}
-    """
-        ).format(*cells)
-    )
\ No newline at end of file
+    cells = list(cells)
+    size = isqrt(len(cells))
+    lines = [
+        "     " + "   ".join(chr(ord("A") + col) for col in range(size)),
+        "   " + "-" * (4 * size + 1),
+    ]
+    for row in range(size):
+        if row:
+            lines.append("  ┆ " + "┼".join(["───"] * size))
+        lines.append(f"{row + 1} ┆  " + " │ ".join(cells[row * size:(row + 1) * size]))
+    print("\n".join(lines) + "\n")
\ No newline at end of file
@@ -8,4 +8,4 @@ from console.players import ConsolePlayer
 player1 = ConsolePlayer(Mark("X"))
 player2= MinimaxComputerPlayer(Mark("O"))
 
-TicTacToe(player1, player2, ConsoleRenderer()).play()
\ No newline at end of file
+TicTacToe(player1, player2, ConsoleRenderer([player1.hints])).play()
\ No newline at end of file
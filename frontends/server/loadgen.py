@@ -0,0 +1,91 @@
+"""Play games against a running server from many clients at once.
+
+Start the server first (python -m server), then run from the frontends folder:
+
+    python -m server.loadgen --clients 50 --games 4
+
+Every client plays random moves against the chosen opponent. A move's
+latency runs from sending it to receiving the state after the server's reply.
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+from .server import DEFAULT_HOST, DEFAULT_PORT
+
+COLUMNS = "ABCD"
+
+
+async def request(writer: asyncio.StreamWriter, message: dict) -> None:
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+
+
+async def client(host: str, port: int, games: int, opponent: str, rng: random.Random, latencies: list[float]) -> dict:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(games):
+            mark = rng.choice("XO")
+            await request(writer, {"cmd": "new", "mark": mark, "opponent": opponent, "starting": rng.choice("XO")})
+            sent = None
+            while True:
+                message = json.loads(await reader.readline())
+                if message["type"] == "error":
+                    raise RuntimeError(message["message"])
+                if message["over"] or message["current"] == mark:
+                    if sent is not None:
+                        latencies.append(time.perf_counter() - sent)
+                        sent = None
+                    if message["over"]:
+                        break
+                    empty = [index for index, cell in enumerate(message["grid"]) if cell == " "]
+                    index = rng.choice(empty)
+                    sent = time.perf_counter()
+                    await request(writer, {"cmd": "move", "cell": f"{COLUMNS[index % 4]}{index // 4 + 1}"})
+        await request(writer, {"cmd": "stats"})
+        return json.loads(await reader.readline())
+    finally:
+        writer.close()
+
+
+# quantiles needs two values, a single one is every percentile (None without any)
+def percentile(values: list[float], fraction: float) -> float | None:
+    if len(values) < 2:
+        return values[0] if values else None
+    return statistics.quantiles(values, n=100, method="inclusive")[round(fraction * 100) - 1]
+
+
+async def run(args: argparse.Namespace) -> None:
+    latencies: list[float] = []
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        client(args.host, args.port, args.games, args.opponent, random.Random(f"{args.seed}:{number}"), latencies)
+        for number in range(args.clients)
+    ))
+    elapsed = time.perf_counter() - start
+    stats = max(results, key=lambda stats: stats["cache_hits"] + stats["cache_misses"])
+    probes = stats["cache_hits"] + stats["cache_misses"]
+    print(f"{args.clients} clients, {args.clients * args.games} games, {len(latencies)} moves in {elapsed:.2f} s ({len(latencies) / elapsed:.1f} moves/s)")
+    if latencies:
+        print(f"move latency: p50 {percentile(latencies, 0.50) * 1000:.1f} ms, p99 {percentile(latencies, 0.99) * 1000:.1f} ms, max {max(latencies) * 1000:.1f} ms")
+    else:
+        print("move latency: no moves were made")
+    print(f"shared cache: {stats['cache_size']} positions, hit rate {stats['cache_hits'] / probes if probes else 0:.0%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test a running tic-tac-toe server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--games", type=int, default=4, help="games played by each client")
+    parser.add_argument("--opponent", default="minimax")
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
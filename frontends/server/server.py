@@ -0,0 +1,188 @@
+import argparse
+import asyncio
+import json
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from tic_tac_toe.game.async_engine import AsyncTicTacToe
+from tic_tac_toe.game.async_players import AsyncComputerPlayer, AsyncPlayer, MoveCache
+from tic_tac_toe.game.players import MinimaxComputerPlayer, RandomComputerPlayer, SabotageComputerPlayer
+from tic_tac_toe.game.renderers import Renderer
+from tic_tac_toe.logic.exceptions import InvalidMove
+from tic_tac_toe.logic.models import GameState, Move, Mark
+
+from console.players import grid_to_index
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_SIZE = 100_000
+
+OPPONENTS = {
+    "minimax": MinimaxComputerPlayer,
+    "random": RandomComputerPlayer,
+    "sabotage": SabotageComputerPlayer,
+}
+# the opponents that always answer a position with the same move
+CACHEABLE = {MinimaxComputerPlayer, SabotageComputerPlayer}
+
+
+# for when the client goes away or quits in the middle of a game
+class SessionClosed(Exception):
+    pass
+
+
+# the state shared by every session of one server
+class GameServer:
+    def __init__(self, executor: Executor, cache_size: int = DEFAULT_CACHE_SIZE) -> None:
+        self.executor = executor
+        self.cache = MoveCache(cache_size)
+        self.sessions = 0
+        self.games = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.sessions += 1
+        session = Session(self, reader, writer)
+        try:
+            await session.run()
+        except (SessionClosed, ConnectionError):
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+    def stats(self) -> dict:
+        return {
+            "type": "stats",
+            "sessions": self.sessions,
+            "games": self.games,
+            "cache_size": len(self.cache),
+            "cache_hits": self.cache.hits,
+            "cache_misses": self.cache.misses,
+        }
+
+
+# one client connection, which plays its games one after the other
+#
+# every request and response is a line of JSON:
+#   {"cmd": "new", "mark": "X", "opponent": "minimax", "starting": "X"}
+#   {"cmd": "move", "cell": "A1"}
+#   {"cmd": "stats"}
+#   {"cmd": "quit"}
+# the server answers with {"type": "state", ...} after every move and with
+# {"type": "error", "message": ...} for requests it can't follow
+class Session:
+    def __init__(self, server: GameServer, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.server = server
+        self.reader = reader
+        self.writer = writer
+
+    def send(self, message: dict) -> None:
+        self.writer.write(json.dumps(message).encode() + b"\n")
+
+    def send_error(self, error: Exception | str) -> None:
+        self.send({"type": "error", "message": str(error)})
+
+    async def receive(self) -> dict:
+        await self.writer.drain()
+        while line := await self.reader.readline():
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError:
+                self.send_error("Requests must be JSON objects")
+                continue
+            if not isinstance(request, dict):
+                self.send_error("Requests must be JSON objects")
+            elif request.get("cmd") == "quit":
+                break
+            elif request.get("cmd") == "stats":
+                self.send(self.server.stats())
+            else:
+                return request
+        raise SessionClosed()
+
+    async def run(self) -> None:
+        while True:
+            request = await self.receive()
+            if request.get("cmd") == "new":
+                try:
+                    game, starting_mark = self.new_game(request)
+                except ValueError as ex:
+                    self.send_error(ex)
+                else:
+                    self.server.games += 1
+                    await game.play(starting_mark)
+            else:
+                self.send_error("Start a game first")
+
+    def new_game(self, request: dict) -> tuple[AsyncTicTacToe, Mark]:
+        mark = Mark(request.get("mark", "X"))
+        starting_mark = Mark(request.get("starting", "X"))
+        opponent = request.get("opponent", "minimax")
+        if opponent not in OPPONENTS:
+            raise ValueError(f"Unknown opponent, choose from: {', '.join(OPPONENTS)}")
+        player_class = OPPONENTS[opponent]
+        cache = self.server.cache if player_class in CACHEABLE else None
+        computer = AsyncComputerPlayer(player_class, mark.other, executor=self.server.executor, cache=cache)
+        game = AsyncTicTacToe(RemotePlayer(self, mark), computer, SessionRenderer(self), self.send_error)
+        return game, starting_mark
+
+
+# the player at the other end of the connection
+class RemotePlayer(AsyncPlayer):
+    def __init__(self, session: Session, mark: Mark) -> None:
+        super().__init__(mark)
+        self.session = session
+
+    async def get_move(self, game_state: GameState) -> Move | None:
+        while not game_state.game_over:
+            request = await self.session.receive()
+            if request.get("cmd") != "move":
+                self.session.send_error("Finish or quit the current game first")
+                continue
+            try:
+                index = grid_to_index(str(request.get("cell", "")))
+            except ValueError:
+                self.session.send_error("Please provide coordinates in the form of A1 or 1A")
+            else:
+                try:
+                    return game_state.make_move_to(index)
+                except InvalidMove:
+                    self.session.send_error("That cell is already occupied.")
+        return None
+
+
+# sends every state of the game to the client
+class SessionRenderer(Renderer):
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+    def render(self, game_state: GameState) -> None:
+        self.session.send({
+            "type": "state",
+            "grid": game_state.grid.cells,
+            "current": game_state.current_mark.value,
+            "winner": game_state.winner.value if game_state.winner else None,
+            "tie": game_state.tie,
+            "over": game_state.game_over,
+        })
+
+
+async def serve(host: str, port: int, workers: int | None, cache_size: int) -> None:
+    with ProcessPoolExecutor(workers) as executor:
+        game_server = GameServer(executor, cache_size)
+        server = await asyncio.start_server(game_server.handle, host, port)
+        print(f"Serving on {', '.join(str(sock.getsockname()) for sock in server.sockets)}")
+        async with server:
+            await server.serve_forever()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve tic-tac-toe games over TCP")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None, help="processes computing the moves (one per core by default)")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE, help="positions kept in the shared move cache")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.cache_size))
+    except KeyboardInterrupt:
+        pass
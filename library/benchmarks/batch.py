@@ -0,0 +1,52 @@
+"""Compare scoring positions one at a time with scoring them as a numpy batch.
+
+Needs the optional numpy dependency (python -m pip install "library/[batch]").
+Run from the repository root after installing the library:
+
+    python library/benchmarks/batch.py
+"""
+import time
+
+import numpy as np
+
+from tic_tac_toe.logic.batch import evaluate_batch
+from tic_tac_toe.logic.minimax import MINIMAX_DEPTH, SearchContext, search_root
+from tic_tac_toe.logic.models import GameState, Grid, Mark
+
+from evaluation import random_positions
+
+POSITION_COUNT = 20000
+BATCH_ROUNDS = 50
+POSITIONS = (
+    GameState(Grid("     X          "), Mark("X")),
+    GameState(Grid("X    O    X     "), Mark("X")),
+    GameState(Grid("XO  OX  X   O   "), Mark("X")),
+)
+
+
+def main() -> None:
+    positions = random_positions(POSITION_COUNT)
+    bitboards = np.array([tuple(game_state.grid.bitboard) for game_state in positions], dtype=np.uint16)
+
+    start = time.perf_counter()
+    for game_state in positions:
+        game_state.evaluate_score(Mark.CROSS)
+    elapsed = time.perf_counter() - start
+    print(f"  one at a time: {POSITION_COUNT / elapsed:14,.0f} evaluations/s")
+
+    start = time.perf_counter()
+    for _ in range(BATCH_ROUNDS):
+        evaluate_batch(bitboards, Mark.CROSS)
+    elapsed = time.perf_counter() - start
+    print(f"          batch: {POSITION_COUNT * BATCH_ROUNDS / elapsed:14,.0f} evaluations/s")
+
+    for batch_leaves in (False, True):
+        start = time.perf_counter()
+        for game_state in POSITIONS:
+            search_root(game_state, game_state.current_mark, MINIMAX_DEPTH, SearchContext(batch_leaves=batch_leaves), maximize=True)
+        elapsed = time.perf_counter() - start
+        print(f"search, batch_leaves={batch_leaves!s:>5}: {elapsed:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Show how the cost of the search grows with the size of the board.
+
+Run from the repository root after installing the library:
+
+    python library/benchmarks/board_size.py [--depth N]
+"""
+import argparse
+import time
+
+from tic_tac_toe.logic.bitboard import board_geometry
+from tic_tac_toe.logic.evaluation import line_tables
+from tic_tac_toe.logic.minimax import MINIMAX_DEPTH, SearchContext, search_root
+from tic_tac_toe.logic.models import GameState, Grid, Mark
+from tic_tac_toe.logic.ordering import HeuristicOrdering
+from tic_tac_toe.logic.symmetry import symmetry_tables
+from tic_tac_toe.logic.transposition import TranspositionTable
+
+# (size, win length) pairs, from the classic game up to boards the fixed-depth
+# search can still finish in a few seconds
+GEOMETRIES = ((3, 3), (4, 3), (4, 4), (5, 4), (6, 4), (7, 5))
+
+
+# the position after X took the cell left of the centre and O a corner, so
+# every size is searched from the same kind of position
+def opening(size: int, win_length: int) -> GameState:
+    grid = Grid.empty_board(size, win_length)
+    centre = (size // 2) * size + (size - 1) // 2
+    cells = list(grid.cells)
+    cells[centre], cells[0] = "X", "O"
+    return GameState(Grid("".join(cells), win_length), Mark("X"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time the search on boards of every size")
+    parser.add_argument("--depth", type=int, default=MINIMAX_DEPTH, help="deepest search to time")
+    args = parser.parse_args()
+
+    for size, win_length in GEOMETRIES:
+        # the masks and tables of a geometry are built once, on first use
+        start = time.perf_counter()
+        geometry = board_geometry(size, win_length)
+        line_tables(geometry)
+        symmetry_tables(size)
+        built = time.perf_counter() - start
+        print(f"{size}x{size}, {win_length} in a row: {len(geometry.win_masks)} lines, tables built in {built * 1000:.1f} ms")
+
+        game_state = opening(size, win_length)
+        for depth in range(1, args.depth + 1):
+            context = SearchContext(TranspositionTable(), symmetric=True, ordering=HeuristicOrdering())
+            start = time.perf_counter()
+            search_root(game_state, game_state.current_mark, depth, context, maximize=True)
+            elapsed = time.perf_counter() - start
+            print(f"  depth {depth}: {context.nodes:9d} nodes, {context.cutoffs:8d} cutoffs, {elapsed:8.3f} s, {context.nodes / elapsed:10,.0f} nodes/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Play many games at once on one event loop with the async engine.
+
+Run from the repository root after installing the library:
+
+    python library/benchmarks/concurrency.py [games] [workers]
+
+Reports games per second and how late a 10 ms ticker on the same loop ran,
+which stays small as long as no game blocks the loop.
+"""
+import asyncio
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from tic_tac_toe.game.async_engine import AsyncTicTacToe
+from tic_tac_toe.game.async_players import AsyncComputerPlayer
+from tic_tac_toe.game.players import MinimaxComputerPlayer, RandomComputerPlayer
+from tic_tac_toe.game.selfplay import NullRenderer
+from tic_tac_toe.logic.models import Mark
+
+TICK_SECONDS = 0.01
+
+
+async def ticker(lags: list[float]) -> None:
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(time.perf_counter() - start - TICK_SECONDS)
+
+
+async def run(games: int, workers: int) -> None:
+    random.seed(0)
+    lags: list[float] = []
+    with ProcessPoolExecutor(workers) as executor:
+        tick = asyncio.create_task(ticker(lags))
+        start = time.perf_counter()
+        results = await asyncio.gather(*(
+            AsyncTicTacToe(
+                AsyncComputerPlayer(RandomComputerPlayer, Mark("X"), executor=executor),
+                AsyncComputerPlayer(MinimaxComputerPlayer, Mark("O"), executor=executor),
+                NullRenderer(),
+            ).play()
+            for _ in range(games)
+        ))
+        elapsed = time.perf_counter() - start
+        tick.cancel()
+    finished = sum(game_state.game_over for game_state in results)
+    print(f"{finished} games in {elapsed:.2f} s ({finished / elapsed:.1f} games/s) on {workers} workers")
+    # the games can finish before the ticker woke up even once
+    if lags:
+        print(f"loop lag: median {statistics.median(lags) * 1000:.2f} ms, max {max(lags) * 1000:.2f} ms")
+    else:
+        print("loop lag: no ticks, the games finished within one tick")
+
+
+def main() -> None:
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    asyncio.run(run(games, workers))
+
+
+if __name__ == "__main__":
+    main()
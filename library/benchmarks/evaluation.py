@@ -0,0 +1,47 @@
+"""Count evaluations per second of the line table and the original evaluator.
+
+Run from the repository root after installing the library:
+
+    python library/benchmarks/evaluation.py
+"""
+import random
+import time
+
+from tic_tac_toe.logic.models import GameState, Grid, Mark
+
+POSITION_COUNT = 2000
+ROUNDS = 10
+
+
+# unfinished positions reached by random play, the same ones on every run
+def random_positions(count: int, seed: int = 2024) -> list[GameState]:
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        game_state = GameState(Grid(), rng.choice(list(Mark)))
+        for _ in range(rng.randint(1, 12)):
+            if game_state.game_over:
+                break
+            game_state = game_state.after_move_to(rng.choice(game_state.possible_cells))
+        if not game_state.game_over:
+            positions.append(game_state)
+    return positions
+
+
+def main() -> None:
+    positions = random_positions(POSITION_COUNT)
+    evaluators = {
+        "line table": GameState.line_evaluation,
+        "original": GameState.evaluation_function,
+    }
+    for name, evaluator in evaluators.items():
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            for game_state in positions:
+                evaluator(game_state, Mark.CROSS)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>10}: {POSITION_COUNT * ROUNDS / elapsed:12,.0f} evaluations/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Compare the ways the search can generate moves.
+
+eager builds every child Move up front (possible_moves), lazy builds only
+the child state it searches next (after_move_to), and make/unmake plays
+the moves on one SearchBoard, as the search does now.
+
+Run from the repository root after installing the library:
+
+    python library/benchmarks/movegen.py
+"""
+import time
+import tracemalloc
+
+from tic_tac_toe.logic.minimax import MINIMAX_DEPTH, alphabeta
+from tic_tac_toe.logic.models import GameState, Grid, Mark
+
+POSITIONS = (
+    GameState(Grid("     X          "), Mark("X")),
+    GameState(Grid("X    O    X     "), Mark("X")),
+    GameState(Grid("XO  OX  X   O   "), Mark("X")),
+)
+
+
+# the search as it was before, building every child Move up front
+def eager_alphabeta(game_state: GameState, mark: Mark, is_maximizing: bool, remaining_depth: int, alpha: float = float('-inf'), beta: float = float('inf')) -> int:
+    if remaining_depth <= 0 or game_state.game_over:
+        return game_state.evaluate_score(mark)
+    best_score = float('-inf') if is_maximizing else float('inf')
+    for move in game_state.possible_moves:
+        score = eager_alphabeta(move.after_state, mark, not is_maximizing, remaining_depth - 1, alpha, beta)
+        if is_maximizing:
+            best_score = max(best_score, score)
+            alpha = max(alpha, best_score)
+        else:
+            best_score = min(best_score, score)
+            beta = min(beta, best_score)
+        if alpha >= beta:
+            break
+    return best_score
+
+
+# the search building each child state only when it gets to it
+def lazy_alphabeta(game_state: GameState, mark: Mark, is_maximizing: bool, remaining_depth: int, alpha: float = float('-inf'), beta: float = float('inf')) -> int:
+    if remaining_depth <= 0 or game_state.game_over:
+        return game_state.evaluate_score(mark)
+    best_score = float('-inf') if is_maximizing else float('inf')
+    for index in game_state.possible_cells:
+        score = lazy_alphabeta(game_state.after_move_to(index), mark, not is_maximizing, remaining_depth - 1, alpha, beta)
+        if is_maximizing:
+            best_score = max(best_score, score)
+            alpha = max(alpha, best_score)
+        else:
+            best_score = min(best_score, score)
+            beta = min(beta, best_score)
+        if alpha >= beta:
+            break
+    return best_score
+
+
+def search_all(search) -> None:
+    for game_state in POSITIONS:
+        # a new state every time, so nothing cached by an earlier pass is reused
+        search(GameState(Grid(game_state.grid.cells), game_state.starting_mark), game_state.current_mark, True, MINIMAX_DEPTH)
+
+
+# the time and the peak memory are measured in separate passes, tracing the
+# allocations slows the search down
+def measure(search) -> tuple[float, int]:
+    start = time.perf_counter()
+    search_all(search)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    search_all(search)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    for name, search in (("eager", eager_alphabeta), ("lazy", lazy_alphabeta), ("make/unmake", alphabeta)):
+        elapsed, peak = measure(search)
+        print(f"{name:>11}: {elapsed:8.3f} s, peak memory {peak / 1024:10.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
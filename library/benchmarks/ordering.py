@@ -0,0 +1,45 @@
+"""Count nodes and cutoffs of the alpha-beta search under each move ordering.
+
+Run from the repository root after installing the library:
+
+    python library/benchmarks/ordering.py
+"""
+import time
+
+from tic_tac_toe.logic.minimax import MINIMAX_DEPTH, SearchContext, search_root
+from tic_tac_toe.logic.models import GameState, Grid, Mark
+from tic_tac_toe.logic.ordering import HeuristicOrdering, MoveOrdering
+from tic_tac_toe.logic.transposition import TranspositionTable
+
+POSITIONS = (
+    GameState(Grid("     X          "), Mark("X")),
+    GameState(Grid("X    O    X     "), Mark("X")),
+    GameState(Grid("XO  OX  X   O   "), Mark("X")),
+    GameState(Grid(" X  OO  X X  O  "), Mark("X")),
+    GameState(Grid("OX XOOO    XX X "), Mark("X")),
+)
+
+ORDERINGS = {
+    "cell order": MoveOrdering,
+    "heuristic": HeuristicOrdering,
+}
+
+
+def main() -> None:
+    for use_table in (False, True):
+        print("with transposition table" if use_table else "without transposition table")
+        for name, ordering in ORDERINGS.items():
+            nodes = cutoffs = 0
+            start = time.perf_counter()
+            for game_state in POSITIONS:
+                table = TranspositionTable() if use_table else None
+                context = SearchContext(table, ordering=ordering())
+                search_root(game_state, game_state.current_mark, MINIMAX_DEPTH, context, maximize=True)
+                nodes += context.nodes
+                cutoffs += context.cutoffs
+            elapsed = time.perf_counter() - start
+            print(f"  {name:>10}: {nodes:8d} nodes, {cutoffs:7d} cutoffs, {elapsed:7.3f} s")
+
+
+if __name__ == "__main__":
+    main()
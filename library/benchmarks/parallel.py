@@ -0,0 +1,52 @@
+"""Time the root-split parallel search against the sequential one.
+
+Run from the repository root after installing the library:
+
+    python library/benchmarks/parallel.py
+"""
+import os
+import time
+
+from tic_tac_toe.logic.minimax import find_best_move, find_worst_move
+from tic_tac_toe.logic.models import GameState, Grid, Mark
+from tic_tac_toe.logic.ordering import HeuristicOrdering
+from tic_tac_toe.logic.parallel import SearchPool
+from tic_tac_toe.logic.transposition import TranspositionTable
+
+POSITIONS = (
+    GameState(Grid("     X          "), Mark("X")),
+    GameState(Grid("X    O    X     "), Mark("X")),
+    GameState(Grid("XO  OX  X   O   "), Mark("X")),
+    GameState(Grid(" X  OO  X X  O  "), Mark("X")),
+)
+
+
+def run(best, worst) -> tuple[float, list[int]]:
+    start = time.perf_counter()
+    cells = []
+    for game_state in POSITIONS:
+        cells.append(best(game_state, game_state.current_mark).cell_index)
+        cells.append(worst(game_state, game_state.current_mark).cell_index)
+    return time.perf_counter() - start, cells
+
+
+def main() -> None:
+    # searched like a single worker would: one table and the heuristic ordering
+    table = TranspositionTable()
+    sequential, expected = run(
+        lambda game_state, mark: find_best_move(game_state, mark, table, ordering=HeuristicOrdering()),
+        lambda game_state, mark: find_worst_move(game_state, mark, table, ordering=HeuristicOrdering()),
+    )
+    print(f"sequential: {sequential:7.3f} s")
+    workers = 1
+    while workers <= (os.cpu_count() or 1) * 2:
+        # a fresh pool each time, so no worker starts with a warm table
+        with SearchPool(workers) as pool:
+            elapsed, cells = run(pool.find_best_move, pool.find_worst_move)
+        status = "same moves" if cells == expected else "DIFFERENT MOVES"
+        print(f"{workers:3d} workers: {elapsed:7.3f} s, speedup {sequential / elapsed:5.2f}x, {status}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Time the engine's hot paths on fixed positions and compare with a baseline.
+
+Run from the repository root after installing the library:
+
+    python library/benchmarks/suite.py --save     # record a baseline
+    python library/benchmarks/suite.py --compare  # flag regressions against it
+
+The exit status is 1 when --compare finds a regression.
+"""
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import fields
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+from tic_tac_toe.logic.minimax import SearchStats, find_best_move, find_worst_move
+from tic_tac_toe.logic.models import GameState, Grid, Mark
+from tic_tac_toe.logic.validators import validate_game_state
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+# a case regresses when it gets this much slower or uses this much more memory
+DEFAULT_THRESHOLD = 0.10
+ROUNDS = 5
+
+CORPORA = {
+    "opening": tuple(GameState(Grid(cells), Mark("X")) for cells in (
+        "X        O      ",
+        "     X         O",
+        "XO              ",
+        "   O       X    ",
+    )),
+    "midgame": tuple(GameState(Grid(cells), Mark("X")) for cells in (
+        "    XO O OX  X  ",
+        "   OOX XO  X   X",
+        " X O   XO XO X  ",
+        "     O O XXX  OX",
+    )),
+    "near-terminal": tuple(GameState(Grid(cells), Mark("X")) for cells in (
+        "OXX OXO OO OXX X",
+        "XX XO  OOX XX OO",
+        " X XOXO XOXO  XO",
+        "OXOOXXOX X O   X",
+    )),
+}
+
+
+# one timed function, called on every position of a corpus loops times per
+# round, returns the number of search nodes it visited (0 when it doesn't search)
+class Case(NamedTuple):
+    function: Callable[[GameState], int]
+    loops: int
+
+
+def winner(game_state: GameState) -> int:
+    game_state.winner
+    return 0
+
+
+def possible_moves(game_state: GameState) -> int:
+    game_state.possible_moves
+    return 0
+
+
+# the heuristic the search uses by default
+def line_evaluation(game_state: GameState) -> int:
+    game_state.line_evaluation(game_state.current_mark)
+    return 0
+
+
+# the original heuristic, kept to compare against
+def evaluation_function(game_state: GameState) -> int:
+    game_state.evaluation_function(game_state.current_mark)
+    return 0
+
+
+def validate(game_state: GameState) -> int:
+    validate_game_state(game_state)
+    return 0
+
+
+def best_move(game_state: GameState) -> int:
+    stats = SearchStats()
+    find_best_move(game_state, game_state.current_mark, stats=stats)
+    return stats.nodes
+
+
+def worst_move(game_state: GameState) -> int:
+    stats = SearchStats()
+    find_worst_move(game_state, game_state.current_mark, stats=stats)
+    return stats.nodes
+
+
+CASES = {
+    "winner": Case(winner, 5000),
+    "possible_moves": Case(possible_moves, 200),
+    "line_evaluation": Case(line_evaluation, 500),
+    "evaluation_function": Case(evaluation_function, 500),
+    "validate_game_state": Case(validate, 5000),
+    "find_best_move": Case(best_move, 1),
+    "find_worst_move": Case(worst_move, 1),
+}
+
+
+# for dropping the cached properties the validation filled in, only the
+# dataclass fields are kept
+def uncached(instance: GameState | Grid) -> None:
+    names = {field.name for field in fields(instance)}
+    for key in [key for key in instance.__dict__ if key not in names]:
+        del instance.__dict__[key]
+
+
+# for copies of the positions without any cached properties (on the state or
+# its grid), so every round measures the work instead of the cache
+def fresh(positions: tuple[GameState, ...], loops: int) -> list[GameState]:
+    copies = []
+    for _ in range(loops):
+        for game_state in positions:
+            copy = GameState(Grid(game_state.grid.cells, game_state.grid.win_length), game_state.starting_mark)
+            uncached(copy.grid)
+            uncached(copy)
+            copies.append(copy)
+    return copies
+
+
+def measure(case: Case, positions: tuple[GameState, ...]) -> dict:
+    best = float("inf")
+    nodes = 0
+    for _ in range(ROUNDS):
+        states = fresh(positions, case.loops)
+        # like timeit, garbage collection is kept out of the timed loop
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            nodes = sum(case.function(game_state) for game_state in states)
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+
+    # memory is traced in a separate pass, tracing slows the timed rounds down
+    states = fresh(positions, case.loops)
+    tracemalloc.start()
+    for game_state in states:
+        case.function(game_state)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {
+        "seconds": best,
+        "calls_per_second": len(states) / best,
+        "peak_kib": peak / 1024,
+    }
+    if nodes:
+        result["nodes"] = nodes
+        result["nodes_per_second"] = nodes / best
+    return result
+
+
+def run_suite() -> dict[str, dict]:
+    return {
+        f"{name}/{corpus}": measure(case, positions)
+        for name, case in CASES.items()
+        for corpus, positions in CORPORA.items()
+    }
+
+
+# for the differences worth reporting, each marked as a regression or not
+def compare(results: dict[str, dict], baseline: dict[str, dict], threshold: float) -> list[tuple[str, str, bool]]:
+    findings = []
+    for key, result in results.items():
+        if (old := baseline.get(key)) is None:
+            continue
+        if result["seconds"] > old["seconds"] * (1 + threshold):
+            findings.append((key, f"{result['seconds'] / old['seconds'] - 1:+.0%} time", True))
+        if result["peak_kib"] > old["peak_kib"] * (1 + threshold) + 1:
+            findings.append((key, f"{result['peak_kib'] / max(old['peak_kib'], 1e-9) - 1:+.0%} peak memory", True))
+        # node counts don't depend on the machine, a change means the search changed
+        if result.get("nodes") != old.get("nodes"):
+            findings.append((key, f"nodes {old.get('nodes')} -> {result.get('nodes')}", False))
+    return findings
+
+
+def print_results(results: dict[str, dict]) -> None:
+    for key, result in results.items():
+        line = f"{key:>36}: {result['seconds'] * 1000:9.2f} ms, {result['calls_per_second']:12,.0f} calls/s, peak {result['peak_kib']:9.1f} KiB"
+        if "nodes" in result:
+            line += f", {result['nodes_per_second']:10,.0f} nodes/s"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the engine's hot paths")
+    parser.add_argument("--save", nargs="?", const=DEFAULT_BASELINE, type=Path, metavar="PATH", help="write the results as the new baseline")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, type=Path, metavar="PATH", help="flag regressions against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown before a case is flagged (0.10 is 10%%)")
+    args = parser.parse_args()
+
+    results = run_suite()
+    print_results(results)
+
+    regressed = False
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        findings = compare(results, baseline["results"], args.threshold)
+        for key, message, regression in findings:
+            print(f"{'REGRESSION' if regression else 'changed':>10} {key}: {message}")
+            regressed |= regression
+        if not findings:
+            print(f"no regressions against {args.compare}")
+    if args.save:
+        args.save.write_text(json.dumps({"python": sys.version, "results": results}, indent=2))
+        print(f"baseline written to {args.save}")
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
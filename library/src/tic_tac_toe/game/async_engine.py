@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+from tic_tac_toe.game.async_players import AsyncPlayer
+from tic_tac_toe.game.engine import ErrorHandler
+from tic_tac_toe.game.hooks import GameHooks
+from tic_tac_toe.game.renderers import Renderer
+from tic_tac_toe.logic.exceptions import InvalidMove
+from tic_tac_toe.logic.models import GameState, Grid, Mark
+from tic_tac_toe.logic.validators import validate_players
+
+# the same game loop as TicTacToe, awaiting the players so many games can
+# share one event loop
+@dataclass(frozen=True)
+class AsyncTicTacToe:
+    player1: AsyncPlayer
+    player2: AsyncPlayer
+    renderer: Renderer
+    error_handler: ErrorHandler | None = None
+    hooks: GameHooks | None = None
+    grid: Grid = Grid()
+
+    def __post_init__(self):
+        validate_players(self.player1, self.player2)
+
+    # returns the final state of the game
+    async def play(self, starting_mark: Mark = Mark("X")) -> GameState:
+        hooks = self.hooks or GameHooks()
+        game_state = GameState(self.grid, starting_mark)
+        self.player1.start_game()
+        self.player2.start_game()
+        hooks.start_game(game_state)
+        while True:
+            hooks.before_render(game_state)
+            self.renderer.render(game_state)
+            hooks.after_render(game_state)
+            if game_state.game_over:
+                break
+            player = self.get_current_player(game_state)
+            try:
+                hooks.before_move(game_state, player)
+                move = await player.select_move(game_state)
+                hooks.after_move(game_state, player, move)
+            except InvalidMove as ex:
+                if self.error_handler:
+                    self.error_handler(ex)
+            else:
+                hooks.before_transition(game_state, move)
+                game_state = move.after_state
+                hooks.after_transition(game_state)
+        self.player1.end_game()
+        self.player2.end_game()
+        hooks.end_game(game_state)
+        return game_state
+
+    def get_current_player(self, game_state: GameState) -> AsyncPlayer:
+        if game_state.current_mark is self.player1.mark:
+            return self.player1
+        else:
+            return self.player2
@@ -0,0 +1,125 @@
+import abc
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Awaitable, Callable, Hashable
+from tic_tac_toe.game.players import ComputerPlayer
+from tic_tac_toe.logic.exceptions import InvalidMove
+from tic_tac_toe.logic.minimax import SearchStats
+from tic_tac_toe.logic.models import GameState, Mark, Move
+from tic_tac_toe.logic.transposition import DEFAULT_TABLE_SIZE
+
+# the computer players of each process, thread and board geometry, built on
+# their first move so their tables outlive a single move without being sent
+# to the executor
+_players: dict[tuple, ComputerPlayer] = {}
+
+
+# runs in the executor, returns the move with its think time and search stats
+def compute_move(player_class: type[ComputerPlayer], mark: Mark, game_state: GameState, options: dict) -> tuple[Move | None, float, SearchStats | None]:
+    key = (player_class, mark, threading.get_ident(), game_state.grid.geometry, *sorted(options.items()))
+    if (player := _players.get(key)) is None:
+        player = _players[key] = player_class(mark, **options)
+    player.last_stats = None
+    start = time.perf_counter()
+    move = player.get_computer_move(game_state)
+    return move, time.perf_counter() - start, player.last_stats
+
+
+# the moves chosen in each position, shared by the players of one event loop
+# so a position is searched once however many games reach it, players asking
+# while the search runs wait for the same result (least recently used moves
+# are evicted)
+class MoveCache:
+    def __init__(self, max_size: int = DEFAULT_TABLE_SIZE) -> None:
+        if max_size < 1:
+            raise ValueError("Cache size must be positive")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._moves: OrderedDict[Hashable, asyncio.Future] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._moves)
+
+    async def get(self, key: Hashable, compute: Callable[[], Awaitable[Move | None]]) -> Move | None:
+        if (future := self._moves.get(key)) is not None:
+            self.hits += 1
+            self._moves.move_to_end(key)
+            return await asyncio.shield(future)
+        self.misses += 1
+        future = self._moves[key] = asyncio.ensure_future(compute())
+        if len(self._moves) > self.max_size:
+            self._moves.popitem(last=False)
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            # a failed search is not cached, the next player tries again
+            if self._moves.get(key) is future:
+                del self._moves[key]
+            raise
+
+
+class AsyncPlayer(metaclass=abc.ABCMeta):
+    def __init__(self, mark: Mark) -> None:
+        self.mark = mark
+
+    async def make_move(self, game_state: GameState) -> GameState:
+        return (await self.select_move(game_state)).after_state
+
+    async def select_move(self, game_state: GameState) -> Move:
+        if self.mark is game_state.current_mark:
+            if move := await self.get_move(game_state):
+                return move
+            raise InvalidMove("No more possible moves")
+        else:
+            raise InvalidMove("It's the other player's turn")
+
+    def start_game(self) -> None:
+        """Prepare the player for a new game."""
+
+    def end_game(self) -> None:
+        """Clean up after the game is over, whoever made the last move."""
+
+    @abc.abstractmethod
+    async def get_move(self, game_state: GameState) -> Move | None:
+        """Return the current player's move in the given game state."""
+
+
+# plays like the given computer player class, the delay is awaited instead of
+# slept and the move is computed in the executor (the loop's default thread
+# pool when None), so games sharing an event loop don't wait on each other
+class AsyncComputerPlayer(AsyncPlayer):
+    def __init__(self, player_class: type[ComputerPlayer], mark: Mark, delay_seconds: float = 0.0, executor: Executor | None = None, cache: MoveCache | None = None, **options) -> None:
+        super().__init__(mark)
+        self.player_class = player_class
+        self.delay_seconds = delay_seconds
+        self.executor = executor
+        # only for players that always choose the same move in a position
+        self.cache = cache
+        # passed on to the player class, e.g. budget or table_size
+        self.options = options
+        self.last_think_seconds = 0.0
+        self.last_stats: SearchStats | None = None
+
+    async def get_move(self, game_state: GameState) -> Move | None:
+        await asyncio.sleep(self.delay_seconds)
+        # the first move is random, so it is never cached
+        if self.cache is None or game_state.game_not_started:
+            return await self.compute_move(game_state)
+        # the same bitboard is a different position on another board geometry
+        key = (self.player_class, self.mark, *game_state.grid.bitboard, game_state.grid.geometry, game_state.starting_mark, *sorted(self.options.items()))
+        start = time.perf_counter()
+        self.last_stats = None
+        move = await self.cache.get(key, lambda: self.compute_move(game_state))
+        self.last_think_seconds = time.perf_counter() - start
+        return move
+
+    async def compute_move(self, game_state: GameState) -> Move | None:
+        loop = asyncio.get_running_loop()
+        move, self.last_think_seconds, self.last_stats = await loop.run_in_executor(
+            self.executor, compute_move, self.player_class, self.mark, game_state, self.options
+        )
+        return move
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from typing import Callable, TypeAlias
+from tic_tac_toe.game.hooks import GameHooks
 from tic_tac_toe.game.players import Player
 from tic_tac_toe.game.renderers import Renderer
 from tic_tac_toe.logic.exceptions import InvalidMove
@@ -15,23 +16,40 @@ class TicTacToe:
     player2: Player
     renderer: Renderer # responsible for visualizing the grid
     error_handler: ErrorHandler | None = None
+    hooks: GameHooks | None = None # for timing or profiling the game loop
+    grid: Grid = Grid() # the empty board every game starts from, sets the size and win length
 
     # validate the marks being placed
     def __post_init__(self):
         validate_players(self.player1, self.player2)
 
     def play(self, starting_mark: Mark = Mark("X")) -> None:
-        game_state = GameState(Grid(), starting_mark)
+        hooks = self.hooks or GameHooks()
+        game_state = GameState(self.grid, starting_mark)
+        self.player1.start_game()
+        self.player2.start_game()
+        hooks.start_game(game_state)
         while True:
+            hooks.before_render(game_state)
             self.renderer.render(game_state)
+            hooks.after_render(game_state)
             if game_state.game_over:
                 break
             player = self.get_current_player(game_state)
             try:
-                game_state = player.make_move(game_state)
+                hooks.before_move(game_state, player)
+                move = player.select_move(game_state)
+                hooks.after_move(game_state, player, move)
             except InvalidMove as ex:
                 if self.error_handler:
                     self.error_handler(ex)
+            else:
+                hooks.before_transition(game_state, move)
+                game_state = move.after_state
+                hooks.after_transition(game_state)
+        self.player1.end_game()
+        self.player2.end_game()
+        hooks.end_game(game_state)
 
     # mapping the current player to their assigned mark
     def get_current_player(self, game_state: GameState) -> Player:
@@ -0,0 +1,94 @@
+import json
+import time
+from typing import TextIO
+from tic_tac_toe.game.players import Player
+from tic_tac_toe.logic.models import GameState, Move
+
+
+# points in the game loop that can be observed, every hook does nothing by default
+class GameHooks:
+    def start_game(self, game_state: GameState) -> None:
+        """Called with the empty grid before the first render."""
+
+    def end_game(self, game_state: GameState) -> None:
+        """Called with the final state after the last render."""
+
+    def before_render(self, game_state: GameState) -> None:
+        """Called before the renderer draws the state."""
+
+    def after_render(self, game_state: GameState) -> None:
+        """Called after the renderer drew the state."""
+
+    def before_move(self, game_state: GameState, player: Player) -> None:
+        """Called before the player chooses a move."""
+
+    def after_move(self, game_state: GameState, player: Player, move: Move) -> None:
+        """Called after the player chose a move."""
+
+    def before_transition(self, game_state: GameState, move: Move) -> None:
+        """Called before the game moves on to the state after the move."""
+
+    def after_transition(self, game_state: GameState) -> None:
+        """Called with the state after the move."""
+
+
+# writes one JSON line per turn with the time spent in each phase, plus one
+# line per game with the result
+class TimingHooks(GameHooks):
+    def __init__(self, file: TextIO) -> None:
+        self.file = file
+        self.game = 0
+        self.turn = 0
+        self.record: dict = {}
+        self._started = 0.0
+
+    def write(self, record: dict) -> None:
+        self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
+
+    def start_game(self, game_state: GameState) -> None:
+        self.game += 1
+        self.turn = 0
+        self.record = {}
+
+    def end_game(self, game_state: GameState) -> None:
+        self.write({
+            "game": self.game,
+            "turns": self.turn,
+            "winner": game_state.winner.value if game_state.winner else None,
+            "render_seconds": self.record.get("render_seconds", 0.0),
+        })
+
+    def before_render(self, game_state: GameState) -> None:
+        self._started = time.perf_counter()
+
+    def after_render(self, game_state: GameState) -> None:
+        self.record = {"render_seconds": time.perf_counter() - self._started}
+
+    def before_move(self, game_state: GameState, player: Player) -> None:
+        self._started = time.perf_counter()
+
+    def after_move(self, game_state: GameState, player: Player, move: Move) -> None:
+        move_seconds = time.perf_counter() - self._started
+        self.turn += 1
+        self.record.update(
+            game=self.game,
+            turn=self.turn,
+            mark=player.mark.value,
+            player=type(player).__name__,
+            cell=move.cell_index,
+            move_seconds=move_seconds,
+        )
+        # the artificial delay of computer players (sync or async, anything
+        # timing its moves) is kept out of the think time
+        if (think_seconds := getattr(player, "last_think_seconds", None)) is not None:
+            self.record.update(think_seconds=think_seconds, delay_seconds=getattr(player, "delay_seconds", 0.0))
+        if (stats := getattr(player, "last_stats", None)) is not None:
+            self.record.update(nodes=stats.nodes, max_depth=stats.max_depth)
+
+    def before_transition(self, game_state: GameState, move: Move) -> None:
+        self._started = time.perf_counter()
+
+    def after_transition(self, game_state: GameState) -> None:
+        self.record["transition_seconds"] = time.perf_counter() - self._started
+        self.write(self.record)
@@ -1,9 +1,19 @@
 import abc
+import threading
 import time
-from typing import Optional
+from contextlib import AbstractContextManager, nullcontext
+from pathlib import Path
+from typing import Callable, Optional
 from tic_tac_toe.logic.models import GameState, Mark, Move
 from tic_tac_toe.logic.exceptions import InvalidMove
-from tic_tac_toe.logic.minimax import find_best_move, find_worst_move
+from tic_tac_toe.logic.mcts import DEFAULT_BUDGET as DEFAULT_MCTS_BUDGET, MctsTree
+from tic_tac_toe.logic.minimax import SearchBudget, SearchStats, find_best_move, find_worst_move
+from tic_tac_toe.logic.opening_book import DEFAULT_PATH as DEFAULT_BOOK_PATH, OpeningBook, shared_book
+from tic_tac_toe.logic.ordering import HeuristicOrdering
+from tic_tac_toe.logic.parallel import SearchPool
+from tic_tac_toe.game.pondering import Ponderer
+from tic_tac_toe.logic.tablebase import DEFAULT_PATH, Tablebase
+from tic_tac_toe.logic.transposition import DEFAULT_TABLE_SIZE, TranspositionTable
 
 
 class Player(metaclass=abc.ABCMeta):
@@ -11,26 +21,90 @@ class Player(metaclass=abc.ABCMeta):
         self.mark = mark
 
     def make_move(self, game_state: GameState) -> GameState:
+        return self.select_move(game_state).after_state
+
+    # for choosing the move without moving on to the next state yet
+    def select_move(self, game_state: GameState) -> Move:
         if self.mark is game_state.current_mark:
             if move := self.get_move(game_state):
-                return move.after_state
+                return move
             raise InvalidMove("No more possible moves")
         else:
             raise InvalidMove("It's the other player's turn")
 
+    def start_game(self) -> None:
+        """Prepare the player for a new game."""
+
+    def end_game(self) -> None:
+        """Clean up after the game is over, whoever made the last move."""
+
     @abc.abstractmethod
     def get_move(self, game_state: GameState) -> Move | None:
         """Return the current player's move in the given game state."""
 
 
 class ComputerPlayer(Player, metaclass=abc.ABCMeta):
-    def __init__(self, mark: Mark, delay_seconds: float = 0.0):
+    def __init__(self, mark: Mark, delay_seconds: float = 0.0, table_size: int = DEFAULT_TABLE_SIZE, budget: SearchBudget | None = None, book_path: Path | None = DEFAULT_BOOK_PATH, pool: SearchPool | None = None, on_search: Callable[[GameState, SearchStats], None] | None = None, profiler: AbstractContextManager | None = None):
         super().__init__(mark)
         self.delay_seconds = delay_seconds
+        # without a budget the searches stop at their fixed depth
+        self.budget = budget
+        # None turns the opening book off
+        self.book_path = book_path
+        # searched positions are kept across moves of the same game
+        self.table = TranspositionTable(table_size)
+        # a shared pool splits fixed-depth searches across processes
+        self.pool = pool
+        # the cost of the last search, None when the last move wasn't searched
+        self.last_stats: SearchStats | None = None
+        # called with the position and the stats after every search (for logging)
+        self.on_search = on_search
+        # wraps only the move computation, e.g. a cProfile.Profile
+        self.profiler = profiler
+        # the time the last move took to compute, without the delay
+        self.last_think_seconds = 0.0
+
+    def start_game(self) -> None:
+        self.table.clear()
+
+    # the book is only read from disk when the first move is asked for
+    @property
+    def opening_book(self) -> OpeningBook:
+        if self.book_path is None:
+            return OpeningBook()
+        return shared_book(self.book_path)
+
+    def search_best_move(self, game_state: GameState) -> Move | None:
+        stats = SearchStats()
+        if self.pool is not None and self.budget is None:
+            move = self.pool.find_best_move(game_state, self.mark, stats)
+        else:
+            move = find_best_move(game_state, self.mark, self.table, symmetric=True, budget=self.budget, ordering=HeuristicOrdering(), stats=stats)
+        self.record_stats(game_state, stats)
+        return move
+
+    def search_worst_move(self, game_state: GameState) -> Move | None:
+        stats = SearchStats()
+        if self.pool is not None and self.budget is None:
+            move = self.pool.find_worst_move(game_state, self.mark, stats)
+        else:
+            move = find_worst_move(game_state, self.mark, self.table, symmetric=True, budget=self.budget, ordering=HeuristicOrdering(), stats=stats)
+        self.record_stats(game_state, stats)
+        return move
+
+    def record_stats(self, game_state: GameState, stats: SearchStats) -> None:
+        self.last_stats = stats
+        if self.on_search is not None:
+            self.on_search(game_state, stats)
 
     def get_move(self, game_state: GameState) -> Move | None:
         time.sleep(self.delay_seconds)
-        return self.get_computer_move(game_state)
+        self.last_stats = None
+        start = time.perf_counter()
+        with self.profiler or nullcontext():
+            move = self.get_computer_move(game_state)
+        self.last_think_seconds = time.perf_counter() - start
+        return move
 
     @abc.abstractmethod
     def get_computer_move(self, game_state: GameState) -> Move | None:
@@ -38,11 +112,48 @@ class ComputerPlayer(Player, metaclass=abc.ABCMeta):
 
 
 class MinimaxComputerPlayer(ComputerPlayer):
+    def __init__(self, mark: Mark, *args, ponder: bool = False, **kwargs) -> None:
+        super().__init__(mark, *args, **kwargs)
+        # searches the likely replies while the opponent thinks
+        self.ponderer = Ponderer(self.ponder_move) if ponder else None
+
+    def start_game(self) -> None:
+        # the table is not cleared under a running ponder search
+        if self.ponderer is not None:
+            self.ponderer.stop()
+        super().start_game()
+
+    # the game may end on the opponent's move, with the ponderer still busy
+    def end_game(self) -> None:
+        if self.ponderer is not None:
+            self.ponderer.stop()
+
     def get_computer_move(self, game_state: GameState) -> Move | None:
+        move = self.choose_move(game_state)
+        if self.ponderer is not None and move is not None and not move.after_state.game_over:
+            self.ponderer.start(move.after_state)
+        return move
+
+    def choose_move(self, game_state: GameState) -> Move | None:
         if game_state.game_not_started:
             return game_state.make_random_move()
+        elif self.ponderer is not None and (pondered := self.ponderer.take(game_state)):
+            move, stats = pondered
+            if stats is not None:
+                self.record_stats(game_state, stats)
+            return move
+        elif move := self.opening_book.best_move(game_state, self.mark):
+            return move
         else:
-            return find_best_move(game_state, self.mark)
+            return self.search_best_move(game_state)
+
+    # the move choose_move would make, run by the ponderer in its thread
+    def ponder_move(self, game_state: GameState, cancel: threading.Event) -> tuple[Move | None, SearchStats | None]:
+        if move := self.opening_book.best_move(game_state, self.mark):
+            return move, None
+        stats = SearchStats()
+        move = find_best_move(game_state, self.mark, self.table, symmetric=True, budget=self.budget, ordering=HeuristicOrdering(), stats=stats, cancel=cancel)
+        return move, stats
 
 
 class SabotageComputerPlayer(ComputerPlayer):
@@ -50,10 +161,59 @@ class SabotageComputerPlayer(ComputerPlayer):
         if game_state.game_not_started:
             return game_state.make_random_move()
         else:
-            return find_worst_move(game_state)
+            return self.get_worst_move(game_state)
     
     def get_worst_move(self, game_state: GameState) -> Move | None:
-        return find_worst_move(game_state, self.mark)
+        if move := self.opening_book.worst_move(game_state, self.mark):
+            return move
+        return self.search_worst_move(game_state)
     
     def get_best_move(self, game_state: GameState) -> Move | None:
-        return find_best_move(game_state, self.mark)
+        if move := self.opening_book.best_move(game_state, self.mark):
+            return move
+        return self.search_best_move(game_state)
+
+
+# Monte Carlo tree search with UCT, the budget counts iterations (nodes) or
+# seconds and a pool plays the leaves out in batches across its workers, the
+# tree is kept for the rest of the game
+class MctsComputerPlayer(ComputerPlayer):
+    def __init__(self, mark: Mark, *args, **kwargs) -> None:
+        super().__init__(mark, *args, **kwargs)
+        self.tree: MctsTree | None = None
+
+    def start_game(self) -> None:
+        super().start_game()
+        self.tree = None
+
+    def get_computer_move(self, game_state: GameState) -> Move | None:
+        # the opponent's reply is usually one step below the last root
+        if self.tree is None or not self.tree.advance(game_state):
+            self.tree = MctsTree(game_state)
+        stats = SearchStats()
+        move = self.tree.search(self.budget or DEFAULT_MCTS_BUDGET, self.pool, stats)
+        self.record_stats(game_state, stats)
+        if move is not None:
+            self.tree.advance(move.after_state)
+        return move
+
+
+class RandomComputerPlayer(ComputerPlayer):
+    def get_computer_move(self, game_state: GameState) -> Move | None:
+        return game_state.make_random_move()
+
+
+class TablebaseComputerPlayer(ComputerPlayer):
+    def __init__(self, mark: Mark, delay_seconds: float = 0.0, tablebase_path: Path = DEFAULT_PATH):
+        super().__init__(mark, delay_seconds, book_path=None)
+        self.tablebase_path = tablebase_path
+        self.tablebase: Tablebase | None = None
+
+    def get_computer_move(self, game_state: GameState) -> Move | None:
+        # the file is only mapped once the first move is asked for
+        if self.tablebase is None:
+            self.tablebase = Tablebase(self.tablebase_path)
+        if move := self.tablebase.best_move(game_state, self.mark):
+            return move
+        # positions missing from a partial tablebase fall back to searching
+        return self.search_best_move(game_state)
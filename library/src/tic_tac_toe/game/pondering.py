@@ -0,0 +1,79 @@
+import threading
+from typing import Callable
+from tic_tac_toe.logic.exceptions import SearchCancelled
+from tic_tac_toe.logic.minimax import SearchStats
+from tic_tac_toe.logic.models import GameState, Move
+
+# a search the ponderer can call off through the event
+PonderSearch = Callable[[GameState, threading.Event], tuple[Move | None, SearchStats | None]]
+
+
+# for the opponent's replies, most likely first: the ones the static
+# evaluation likes best for the opponent (cell order breaks the ties)
+def predict_replies(game_state: GameState) -> list[GameState]:
+    mark = game_state.current_mark
+    replies = [game_state.after_move_to(index) for index in game_state.possible_cells]
+    return sorted(replies, key=lambda reply: -reply.evaluate_score(mark))
+
+
+# searches the positions the opponent may leave behind while the opponent
+# thinks, one after the other in a background thread
+class Ponderer:
+    def __init__(self, search: PonderSearch, max_replies: int | None = None) -> None:
+        self.search = search
+        # None ponders every reply
+        self.max_replies = max_replies
+        self.hits = 0
+        self.misses = 0
+        self._condition = threading.Condition()
+        self._results: dict[GameState, tuple[Move | None, SearchStats | None]] = {}
+        self._current: GameState | None = None
+        self._cancel = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # for pondering on the position left after our move
+    def start(self, game_state: GameState) -> None:
+        self.stop()
+        self._results = {}
+        self._cancel = threading.Event()
+        replies = predict_replies(game_state)[:self.max_replies]
+        self._thread = threading.Thread(target=self._run, args=(replies, self._cancel), name="ponder", daemon=True)
+        self._thread.start()
+
+    # for the result of the actual position, waits when it is the one being
+    # searched and calls the rest of the speculation off, None on a miss
+    def take(self, game_state: GameState) -> tuple[Move | None, SearchStats | None] | None:
+        with self._condition:
+            self._condition.wait_for(lambda: self._current != game_state)
+            result = self._results.get(game_state)
+        self.stop()
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def stop(self) -> None:
+        self._cancel.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, positions: list[GameState], cancel: threading.Event) -> None:
+        try:
+            for position in positions:
+                with self._condition:
+                    if cancel.is_set():
+                        return
+                    self._current = position
+                result = self.search(position, cancel)
+                with self._condition:
+                    self._results[position] = result
+                    self._current = None
+                    self._condition.notify_all()
+        except SearchCancelled:
+            pass
+        finally:
+            with self._condition:
+                self._current = None
+                self._condition.notify_all()
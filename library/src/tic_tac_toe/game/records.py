@@ -0,0 +1,161 @@
+import mmap
+import struct
+from itertools import chain
+from pathlib import Path
+from typing import BinaryIO, Iterator, NamedTuple
+from tic_tac_toe.game.hooks import GameHooks
+from tic_tac_toe.logic.exceptions import InvalidMove
+from tic_tac_toe.logic.models import GameState, Grid, Mark, Move
+
+MAGIC = b"TTGR"
+VERSION = 1
+# magic, version, board size, win length
+HEADER = struct.Struct("<4sBBB")
+# every game starts with one byte: the starting mark in the high bit (set
+# for O) and the number of moves below it, so a board has at most 127 cells
+NAUGHT_STARTS = 0x80
+MAX_CELLS = 0x7F
+# boards of up to 16 cells pack two moves per byte, the first one in the low
+# nibble, larger boards take a byte per move
+NIBBLE_CELLS = 16
+NIBBLES = tuple((byte & 0xF, byte >> 4) for byte in range(256))
+
+
+# the moves of one game, the board comes from the header of the file
+class GameRecord(NamedTuple):
+    starting_mark: Mark
+    cells: tuple[int, ...]
+
+
+def _packed(grid: Grid) -> bool:
+    return grid.geometry.cell_count <= NIBBLE_CELLS
+
+
+# the bytes the moves of a game take after its first byte
+def _moves_size(count: int, packed: bool) -> int:
+    return (count + 1) // 2 if packed else count
+
+
+def _decode(first: int, data: bytes, packed: bool) -> GameRecord:
+    count = first & MAX_CELLS
+    if packed:
+        cells = tuple(chain.from_iterable(map(NIBBLES.__getitem__, data)))[:count]
+    else:
+        cells = tuple(data)
+    return GameRecord(Mark.NAUGHT if first & NAUGHT_STARTS else Mark.CROSS, cells)
+
+
+# for the empty board the games of a file are played on
+def _read_header(data: bytes, name: object) -> Grid:
+    if len(data) < HEADER.size:
+        raise ValueError(f"Truncated game records: {name}")
+    magic, version, size, win_length = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not version {VERSION} game records: {name}")
+    return Grid.empty_board(size, win_length)
+
+
+# for the states of a game from the empty board to the final position, built
+# one at a time as they are iterated, a corrupt record raises ValueError at
+# its first impossible move (off the board, on a taken cell or after the end)
+def replay(record: GameRecord, grid: Grid) -> Iterator[GameState]:
+    game_state = GameState(grid, record.starting_mark)
+    yield game_state
+    for ply, cell in enumerate(record.cells, start=1):
+        try:
+            game_state = game_state.after_move_to(cell)
+        except InvalidMove as ex:
+            raise ValueError(f"Corrupt game record, move {ply} to cell {cell}: {ex}") from ex
+        yield game_state
+
+
+# appends games played on one grid to a binary file, the header is written
+# straight away so the file can be read back while it grows
+class GameRecordWriter:
+    def __init__(self, file: BinaryIO, grid: Grid = Grid()) -> None:
+        if grid.geometry.cell_count > MAX_CELLS:
+            raise ValueError(f"Boards of more than {MAX_CELLS} cells can't be recorded")
+        self.file = file
+        self.grid = grid
+        self.games = 0
+        self._packed = _packed(grid)
+        file.write(HEADER.pack(MAGIC, VERSION, grid.size, grid.win_length))
+
+    def write(self, record: GameRecord) -> None:
+        cells = record.cells
+        first = len(cells) | (NAUGHT_STARTS if record.starting_mark is Mark.NAUGHT else 0)
+        if self._packed:
+            data = bytes(low | high << 4 for low, high in zip(cells[::2], [*cells[1::2], 0]))
+        else:
+            data = bytes(cells)
+        self.file.write(bytes((first,)) + data)
+        self.games += 1
+
+
+# records every game the engine plays, a game is written once it is over
+class RecordingHooks(GameHooks):
+    def __init__(self, writer: GameRecordWriter) -> None:
+        self.writer = writer
+        self.starting_mark = Mark.CROSS
+        self.cells: list[int] = []
+
+    def start_game(self, game_state: GameState) -> None:
+        if game_state.grid != self.writer.grid:
+            raise ValueError("The game isn't played on the grid of the records")
+        self.starting_mark = game_state.starting_mark
+        self.cells = []
+
+    def before_transition(self, game_state: GameState, move: Move) -> None:
+        self.cells.append(move.cell_index)
+
+    def end_game(self, game_state: GameState) -> None:
+        self.writer.write(GameRecord(self.starting_mark, tuple(self.cells)))
+
+
+# reads the games of a binary file object one at a time, e.g. from a pipe or
+# a compressed stream
+class GameRecordReader:
+    def __init__(self, file: BinaryIO) -> None:
+        self.file = file
+        self.grid = _read_header(file.read(HEADER.size), getattr(file, "name", file))
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        packed = _packed(self.grid)
+        while first := self.file.read(1):
+            size = _moves_size(first[0] & MAX_CELLS, packed)
+            data = self.file.read(size)
+            if len(data) < size:
+                raise ValueError(f"Truncated game records: {getattr(self.file, 'name', self.file)}")
+            yield _decode(first[0], data, packed)
+
+    # for the states of every game, each game replayed only when iterated
+    def games(self) -> Iterator[Iterator[GameState]]:
+        for record in self:
+            yield replay(record, self.grid)
+
+
+# reads a whole file of games mapped into memory, the operating system pages
+# it in as the games are decoded instead of it being read up front
+class MappedGameRecords(GameRecordReader):
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with open(path, "rb") as file:
+            # an empty file can't be mapped, it has no header either
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if path.stat().st_size else b""
+        self.grid = _read_header(self._data, path)
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        data = self._data
+        packed = _packed(self.grid)
+        offset, end = HEADER.size, len(data)
+        while offset < end:
+            first = data[offset]
+            start = offset + 1
+            offset = start + _moves_size(first & MAX_CELLS, packed)
+            if offset > end:
+                raise ValueError(f"Truncated game records: {self.path}")
+            yield _decode(first, data[start:offset], packed)
@@ -0,0 +1,96 @@
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from tic_tac_toe.game.engine import TicTacToe
+from tic_tac_toe.game.hooks import GameHooks
+from tic_tac_toe.game.players import ComputerPlayer, Player
+from tic_tac_toe.game.renderers import Renderer
+from tic_tac_toe.logic.models import GameState, Grid, Mark, Move
+
+# games handed to a worker at a time
+CHUNK_SIZE = 8
+
+
+# the totals of a batch of games, the counts are per mark
+@dataclass
+class SelfPlayStats:
+    games: int = 0
+    wins: dict[Mark, int] = field(default_factory=lambda: dict.fromkeys(Mark, 0))
+    ties: int = 0
+    moves: dict[Mark, int] = field(default_factory=lambda: dict.fromkeys(Mark, 0))
+    think_seconds: dict[Mark, float] = field(default_factory=lambda: dict.fromkeys(Mark, 0.0))
+    elapsed_seconds: float = 0.0
+
+    def merge(self, other: "SelfPlayStats") -> None:
+        self.games += other.games
+        self.ties += other.ties
+        for mark in Mark:
+            self.wins[mark] += other.wins[mark]
+            self.moves[mark] += other.moves[mark]
+            self.think_seconds[mark] += other.think_seconds[mark]
+
+    def average_move_seconds(self, mark: Mark) -> float:
+        return self.think_seconds[mark] / self.moves[mark] if self.moves[mark] else 0.0
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+# draws nothing, nobody watches these games
+class NullRenderer(Renderer):
+    def render(self, game_state: GameState) -> None:
+        pass
+
+
+# counts the results and adds up the think time of every move
+class StatsHooks(GameHooks):
+    def __init__(self, stats: SelfPlayStats) -> None:
+        self.stats = stats
+
+    def after_move(self, game_state: GameState, player: Player, move: Move) -> None:
+        mark = player.mark
+        self.stats.moves[mark] += 1
+        if isinstance(player, ComputerPlayer):
+            self.stats.think_seconds[mark] += player.last_think_seconds
+
+    def end_game(self, game_state: GameState) -> None:
+        self.stats.games += 1
+        if game_state.winner:
+            self.stats.wins[game_state.winner] += 1
+        else:
+            self.stats.ties += 1
+
+
+# for playing the games numbered first_game to first_game + count - 1, every
+# game seeds the random moves from its own number so the results do not depend
+# on how the games are split between the workers
+def play_games(player_x: type[ComputerPlayer], player_o: type[ComputerPlayer], first_game: int, count: int, seed: int = 0, starting_mark: Mark = Mark("X"), grid: Grid = Grid()) -> SelfPlayStats:
+    stats = SelfPlayStats()
+    game = TicTacToe(player_x(Mark("X")), player_o(Mark("O")), NullRenderer(), hooks=StatsHooks(stats), grid=grid)
+    for number in range(first_game, first_game + count):
+        random.seed(f"{seed}:{number}")
+        game.play(starting_mark)
+    return stats
+
+
+# for playing the games without rendering, split between worker processes
+# (one per core by default)
+def run_selfplay(games: int, player_x: type[ComputerPlayer], player_o: type[ComputerPlayer], workers: int | None = None, seed: int = 0, starting_mark: Mark = Mark("X"), grid: Grid = Grid()) -> SelfPlayStats:
+    workers = workers or os.cpu_count() or 1
+    stats = SelfPlayStats()
+    start = time.perf_counter()
+    if workers == 1:
+        stats.merge(play_games(player_x, player_o, 0, games, seed, starting_mark, grid))
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            futures = [
+                executor.submit(play_games, player_x, player_o, first_game, min(CHUNK_SIZE, games - first_game), seed, starting_mark, grid)
+                for first_game in range(0, games, CHUNK_SIZE)
+            ]
+            for future in futures:
+                stats.merge(future.result())
+    stats.elapsed_seconds = time.perf_counter() - start
+    return stats
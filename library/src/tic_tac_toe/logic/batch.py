@@ -0,0 +1,85 @@
+from typing import NamedTuple
+import numpy as np
+from tic_tac_toe.logic.bitboard import CELL_COUNT
+from tic_tac_toe.logic.evaluation import LINE_CELLS, LINE_LENGTH, LINE_SCORES, MAX_SCORE, WINNING_LINE_CODES
+from tic_tac_toe.logic.models import Mark
+from tic_tac_toe.logic.search_board import TERMINAL_SCORES, SearchBoard
+
+# winner codes of a batch, also the digits of the cells
+NO_WINNER, CROSS_WINS, NAUGHT_WINS = 0, 1, 2
+# the slot of a tie among the terminal scores
+TIE = 3
+
+_LINE_CELLS = np.array(LINE_CELLS, dtype=np.intp)
+_LINE_WEIGHTS = 3 ** np.arange(LINE_LENGTH)
+_LINE_SCORES = np.array(LINE_SCORES, dtype=np.int64)
+_CELL_BITS = np.arange(CELL_COUNT, dtype=np.int64)
+
+# evaluate_score of finished games for each mark, indexed by the winner code
+# or TIE
+_TERMINAL_SCORES = {
+    mark: np.array([0, TERMINAL_SCORES[Mark.CROSS, mark], TERMINAL_SCORES[Mark.NAUGHT, mark], TERMINAL_SCORES[None, mark]])
+    for mark in Mark
+}
+
+
+# the results for a batch of boards, one entry per board
+class BatchEvaluation(NamedTuple):
+    winner: np.ndarray
+    tie: np.ndarray
+    score: np.ndarray
+
+
+# for turning an N×2 array of (crosses, naughts) bitboards into the N×16
+# array of cell digits: 0 (empty), 1 (X) or 2 (O)
+def cells_from_bitboards(bitboards: np.ndarray) -> np.ndarray:
+    bitboards = np.asarray(bitboards, dtype=np.int64).reshape(-1, 2)
+    crosses = bitboards[:, :1] >> _CELL_BITS & 1
+    naughts = bitboards[:, 1:] >> _CELL_BITS & 1
+    return (crosses + 2 * naughts).astype(np.uint8)
+
+
+# for turning an N×16 array of cell digits into N×2 uint16 bitboards
+def bitboards_from_cells(cells: np.ndarray) -> np.ndarray:
+    cells = np.asarray(cells).reshape(-1, CELL_COUNT)
+    bits = np.int64(1) << _CELL_BITS
+    crosses = ((cells == 1) * bits).sum(axis=1)
+    naughts = ((cells == 2) * bits).sum(axis=1)
+    return np.stack([crosses, naughts], axis=1).astype(np.uint16)
+
+
+# for scoring many boards at once, given either as N×2 bitboards or as N×16
+# cell digits, returns the same scores as GameState.evaluate_score for the mark
+def evaluate_batch(boards: np.ndarray, mark: Mark) -> BatchEvaluation:
+    mark = Mark(mark)
+    boards = np.asarray(boards)
+    if boards.ndim == 2 and boards.shape[1] == CELL_COUNT:
+        cells = boards
+    elif boards.size == 0 or boards.shape[-1] == 2:
+        cells = cells_from_bitboards(boards)
+    else:
+        raise ValueError(f"Expected N×2 bitboards or N×{CELL_COUNT} cells, got shape {boards.shape}")
+
+    codes = cells[:, _LINE_CELLS].astype(np.int64) @ _LINE_WEIGHTS
+    crosses_win = (codes == WINNING_LINE_CODES[CROSS_WINS]).any(axis=1)
+    naughts_win = (codes == WINNING_LINE_CODES[NAUGHT_WINS]).any(axis=1)
+    winner = np.where(crosses_win, CROSS_WINS, np.where(naughts_win, NAUGHT_WINS, NO_WINNER)).astype(np.uint8)
+    tie = (winner == NO_WINNER) & (cells != 0).all(axis=1)
+
+    total = np.clip(_LINE_SCORES[codes].sum(axis=1), -MAX_SCORE, MAX_SCORE)
+    heuristic = total if mark is Mark.CROSS else -total
+    outcome = np.where(tie, TIE, winner)
+    score = np.where(outcome != NO_WINNER, _TERMINAL_SCORES[mark][outcome], heuristic).astype(np.int8)
+    return BatchEvaluation(winner, tie, score)
+
+
+# for scoring every child of a board in one batch, returns the cells played
+# and the score after each of them
+def evaluate_children(board: SearchBoard, mark: Mark) -> tuple[list[int], np.ndarray]:
+    cells = board.possible_cells
+    children = []
+    for index in cells:
+        board.make(index)
+        children.append((board.crosses, board.naughts))
+        board.unmake(index)
+    return cells, evaluate_batch(np.array(children, dtype=np.int64).reshape(-1, 2), mark).score
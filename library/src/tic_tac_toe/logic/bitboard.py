@@ -0,0 +1,149 @@
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Iterator, NamedTuple
+
+# the default board is 4x4 with 4 in a row to win, bit i of a bitboard stands
+# for cell i of the grid (row by row) whatever the size
+SIZE = 4
+WIN_LENGTH = 4
+
+
+# for building the mask of a line from the cells it covers
+def line_mask(cells: Iterator[int]) -> int:
+    mask = 0
+    for cell in cells:
+        mask |= 1 << cell
+    return mask
+
+
+# every run of length cells along a row, a column or a diagonal: the rows
+# first, then the columns, the diagonals and the anti-diagonals
+def win_masks(size: int, length: int) -> tuple[int, ...]:
+    starts = range(size - length + 1)
+    return (
+        *(line_mask(row * size + col + step for step in range(length)) for row in range(size) for col in starts),
+        *(line_mask((row + step) * size + col for step in range(length)) for col in range(size) for row in starts),
+        *(line_mask((row + step) * size + col + step for step in range(length)) for row in starts for col in starts),
+        *(line_mask((row + step) * size + col - step for step in range(length)) for row in starts for col in range(length - 1, size)),
+    )
+
+
+# the masks of one board size and win length, see board_geometry (they are
+# plain attributes rather than cached properties, the search reads them a lot)
+@dataclass(frozen=True)
+class BoardGeometry:
+    size: int
+    win_length: int
+    cell_count: int = field(init=False, compare=False, repr=False)
+    full_mask: int = field(init=False, compare=False, repr=False)
+    win_masks: tuple[int, ...] = field(init=False, compare=False, repr=False)
+    # the winning lines going through each cell, so a move only checks its own lines
+    cell_win_masks: tuple[tuple[int, ...], ...] = field(init=False, compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        cell_count = self.size * self.size
+        masks = win_masks(self.size, self.win_length)
+        object.__setattr__(self, "cell_count", cell_count)
+        object.__setattr__(self, "full_mask", (1 << cell_count) - 1)
+        object.__setattr__(self, "win_masks", masks)
+        object.__setattr__(self, "cell_win_masks", tuple(
+            tuple(mask for mask in masks if mask >> cell & 1)
+            for cell in range(cell_count)
+        ))
+
+    # unpickled geometries are the cached ones too, so the tables cached per
+    # geometry are shared with them
+    def __reduce__(self) -> tuple:
+        return board_geometry, (self.size, self.win_length)
+
+    # for checking whether one more mark on the cell completes a line
+    def completes_line(self, bits: int, index: int) -> bool:
+        bits |= 1 << index
+        for mask in self.cell_win_masks[index]:
+            if bits & mask == mask:
+                return True
+        return False
+
+    # for finding the first completed line, returns the mark and the line mask
+    def winning_line(self, bitboard: "Bitboard") -> tuple[str, int] | None:
+        crosses, naughts = bitboard
+        for mask in self.win_masks:
+            if crosses & mask == mask:
+                return "X", mask
+            if naughts & mask == mask:
+                return "O", mask
+        return None
+
+    def empty(self, bitboard: "Bitboard") -> int:
+        return ~(bitboard.crosses | bitboard.naughts) & self.full_mask
+
+    # the string view of the grid (used by the renderers)
+    def cells(self, bitboard: "Bitboard") -> str:
+        crosses, naughts = bitboard
+        return "".join(
+            "X" if crosses >> index & 1
+            else "O" if naughts >> index & 1
+            else " "
+            for index in range(self.cell_count)
+        )
+
+
+# one geometry per board size and win length (the whole side by default), so
+# the masks are only generated the first time a size is played
+def board_geometry(size: int = SIZE, win_length: int | None = None) -> BoardGeometry:
+    return _board_geometry(size, size if win_length is None else win_length)
+
+
+# cached on the resolved win length, a default and an explicit one are the same geometry
+@lru_cache(maxsize=None)
+def _board_geometry(size: int, win_length: int) -> BoardGeometry:
+    return BoardGeometry(size, win_length)
+
+
+DEFAULT_GEOMETRY = board_geometry(SIZE, WIN_LENGTH)
+
+# the masks of the default board, for the code that only handles 4x4 (the
+# tablebase and the opening book)
+CELL_COUNT = DEFAULT_GEOMETRY.cell_count
+FULL_MASK = DEFAULT_GEOMETRY.full_mask
+WIN_MASKS = DEFAULT_GEOMETRY.win_masks
+CELL_WIN_MASKS = DEFAULT_GEOMETRY.cell_win_masks
+
+
+# for walking over the indices of the set bits, lowest first
+def iter_bits(mask: int) -> Iterator[int]:
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+# the board as two integers, one per mark
+class Bitboard(NamedTuple):
+    crosses: int = 0
+    naughts: int = 0
+
+    # for converting the string view of the grid
+    @classmethod
+    def from_cells(cls, cells: str) -> "Bitboard":
+        crosses = naughts = 0
+        for index, cell in enumerate(cells):
+            if cell == "X":
+                crosses |= 1 << index
+            elif cell == "O":
+                naughts |= 1 << index
+        return cls(crosses, naughts)
+
+    @property
+    def occupied(self) -> int:
+        return self.crosses | self.naughts
+
+    # for the bits of the given mark ("X" or "O")
+    def mark_bits(self, mark: str) -> int:
+        return self.crosses if mark == "X" else self.naughts
+
+    # for placing a mark on an empty cell
+    def place(self, index: int, mark: str) -> "Bitboard":
+        if mark == "X":
+            return Bitboard(self.crosses | 1 << index, self.naughts)
+        return Bitboard(self.crosses, self.naughts | 1 << index)
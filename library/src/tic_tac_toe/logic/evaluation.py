@@ -0,0 +1,116 @@
+from functools import lru_cache
+from itertools import product
+from typing import NamedTuple
+from tic_tac_toe.logic.bitboard import DEFAULT_GEOMETRY, Bitboard, BoardGeometry, iter_bits
+
+# the score of the heuristic stays within the terminal scores of evaluate_score
+MAX_SCORE = 2
+
+
+# for scoring one line from X's point of view, cells are 0 (empty), 1 (X) or 2 (O)
+def score_line(cells: tuple[int, ...]) -> int:
+    crosses = [position for position, cell in enumerate(cells) if cell == 1]
+    naughts = [position for position, cell in enumerate(cells) if cell == 2]
+    if crosses and naughts:
+        return 0  # nobody can win this line any more
+    marks, sign = (crosses, 1) if crosses else (naughts, -1)
+    if len(marks) >= len(cells):
+        return 0  # a finished line is scored by evaluate_score
+    if len(marks) == len(cells) - 1:
+        return 2 * sign  # one move away from winning
+    if len(marks) >= 2 and any(second - first == 1 for first, second in zip(marks, marks[1:])):
+        return 2 * sign  # two in a row
+    if len(marks) == 2 and marks[1] - marks[0] == 2:
+        return sign  # split pair, more risky so worth less
+    return 0
+
+
+# the score of each of the 3 ** length states of a line, indexed by its
+# base-3 code (the first cell is the lowest digit)
+@lru_cache(maxsize=None)
+def line_scores(length: int) -> tuple[int, ...]:
+    return tuple(
+        score_line(tuple(reversed(cells)))
+        for cells in product(range(3), repeat=length)
+    )
+
+
+# the tables the evaluation of one board geometry reads
+class LineTables(NamedTuple):
+    # the cells of each winning line, in board order
+    line_cells: tuple[tuple[int, ...], ...]
+    line_scores: tuple[int, ...]
+    # for updating line codes one move at a time: the lines through each
+    # cell with the weight of the cell's digit in their code
+    cell_line_weights: tuple[tuple[tuple[int, int], ...], ...]
+    # the code of a line filled with X (digit 1) or with O (digit 2)
+    winning_line_codes: tuple[int | None, int, int]
+    # each line mask with the scores keyed by the bits of both marks on it
+    masked_tables: tuple[tuple[int, dict[int, int]], ...]
+
+
+# for each line, the bits of both marks on it (naughts shifted past the
+# crosses) mapped to the score of the line
+def _line_table(cells: tuple[int, ...], scores: tuple[int, ...], cell_count: int) -> dict[int, int]:
+    table = {}
+    for code, score in enumerate(scores):
+        crosses = naughts = 0
+        digits = code
+        for cell in cells:
+            digits, state = divmod(digits, 3)
+            if state == 1:
+                crosses |= 1 << cell
+            elif state == 2:
+                naughts |= 1 << cell
+        table[crosses | naughts << cell_count] = score
+    return table
+
+
+# the tables are built the first time a geometry is evaluated
+@lru_cache(maxsize=None)
+def line_tables(geometry: BoardGeometry) -> LineTables:
+    line_cells = tuple(tuple(iter_bits(mask)) for mask in geometry.win_masks)
+    length = geometry.win_length
+    scores = line_scores(length)
+    return LineTables(
+        line_cells=line_cells,
+        line_scores=scores,
+        cell_line_weights=tuple(
+            tuple(
+                (line, 3 ** cells.index(cell))
+                for line, cells in enumerate(line_cells)
+                if cell in cells
+            )
+            for cell in range(geometry.cell_count)
+        ),
+        winning_line_codes=(None, (3 ** length - 1) // 2, 3 ** length - 1),
+        masked_tables=tuple(
+            (mask, _line_table(cells, scores, geometry.cell_count))
+            for mask, cells in zip(geometry.win_masks, line_cells)
+        ),
+    )
+
+
+# the tables of the default 4x4 board (the numpy batch only handles that one)
+DEFAULT_TABLES = line_tables(DEFAULT_GEOMETRY)
+LINE_CELLS = DEFAULT_TABLES.line_cells
+LINE_LENGTH = DEFAULT_GEOMETRY.win_length
+LINE_SCORES = DEFAULT_TABLES.line_scores
+CELL_LINE_WEIGHTS = DEFAULT_TABLES.cell_line_weights
+WINNING_LINE_CODES = DEFAULT_TABLES.winning_line_codes
+
+
+# for turning the sum of the line scores into the score for a mark
+def clamp_lines(total: int, mark: str) -> int:
+    total = max(-MAX_SCORE, min(MAX_SCORE, total))
+    return total if mark == "X" else -total
+
+
+# for scoring a position by adding up the table scores of its lines
+def evaluate_lines(bitboard: Bitboard, mark: str, geometry: BoardGeometry = DEFAULT_GEOMETRY) -> int:
+    crosses, naughts = bitboard
+    shift = geometry.cell_count
+    total = 0
+    for mask, table in line_tables(geometry).masked_tables:
+        total += table[crosses & mask | (naughts & mask) << shift]
+    return clamp_lines(total, mark)
@@ -5,4 +5,10 @@ class InvalidMove(Exception):
     """Raised when the move is invalid"""
 
 class UnknownGameScore(Exception):
-    """Raised when the game score is unknown"""
\ No newline at end of file
+    """Raised when the game score is unknown"""
+
+class SearchBudgetExceeded(Exception):
+    """Raised when a search runs out of its time or node budget"""
+
+class SearchCancelled(Exception):
+    """Raised when a search is called off before it finishes"""
\ No newline at end of file
@@ -0,0 +1,190 @@
+import math
+import random
+import time
+from typing import Callable
+from tic_tac_toe.logic.minimax import SearchBudget, SearchStats
+from tic_tac_toe.logic.models import GameState, Mark, Move
+from tic_tac_toe.logic.parallel import SearchPool
+from tic_tac_toe.logic.search_board import TERMINAL_SCORES, SearchBoard
+
+# every iteration expands at most one node, so the node budget is the number
+# of iterations
+DEFAULT_BUDGET = SearchBudget(nodes=2000)
+# the exploration constant of UCT
+EXPLORATION = math.sqrt(2)
+# leaves played out by each worker of a pool per batch
+LEAVES_PER_WORKER = 16
+
+# the result of a playout for the mark that made the last move, the terminal
+# scores of evaluate_score scaled from [-2, 2] to [0, 1] so the tree plays for
+# the same goals as the minimax players
+REWARDS = {key: (score + 2) / 4 for key, score in TERMINAL_SCORES.items()}
+
+
+# one position of the tree, reached by playing cell from its parent, the
+# reward is counted for the mark that played it
+class Node:
+    __slots__ = ("cell", "children", "untried", "visits", "reward")
+
+    def __init__(self, cell: int | None, untried: list[int]) -> None:
+        self.cell = cell
+        self.children: dict[int, Node] = {}
+        # the cells no child has been expanded for yet
+        self.untried = untried
+        self.visits = 0
+        self.reward = 0.0
+
+    # the child with the highest upper confidence bound (UCT)
+    def select_child(self) -> "Node":
+        log_visits = math.log(self.visits)
+        return max(
+            self.children.values(),
+            key=lambda child: child.reward / child.visits + EXPLORATION * math.sqrt(log_visits / child.visits),
+        )
+
+
+# for playing random moves until the game is over, returns the winner (None
+# for a tie), the moves are taken back so the board can be used again
+def play_out(board: SearchBoard, choice: Callable[[list[int]], int] = random.choice) -> Mark | None:
+    played = []
+    while not board.game_over:
+        cell = choice(board.possible_cells)
+        board.make(cell)
+        played.append(cell)
+    winner = board.winner
+    for cell in reversed(played):
+        board.unmake(cell)
+    return winner
+
+
+# runs in a worker process, plays out one batch of leaves
+def play_out_batch(positions: list[GameState], seed: int) -> list[Mark | None]:
+    choice = random.Random(seed).choice
+    return [play_out(SearchBoard(game_state), choice) for game_state in positions]
+
+
+# a Monte Carlo search tree rooted at a game state, kept between moves so the
+# playouts below the position the game reaches are not thrown away
+class MctsTree:
+    def __init__(self, game_state: GameState) -> None:
+        self.game_state = game_state
+        # a copy, expanding the root pops from it
+        self.root = Node(None, list(game_state.possible_cells))
+
+    # for moving the root down to a position reached from it by the given
+    # moves, returns False (leaving the tree as it was) when the position
+    # isn't below the root
+    def advance(self, game_state: GameState) -> bool:
+        old, new = self.game_state, game_state
+        if new.starting_mark is not old.starting_mark or new.grid.geometry != old.grid.geometry:
+            return False
+        (old_crosses, old_naughts), (new_crosses, new_naughts) = old.grid.bitboard, new.grid.bitboard
+        if old_crosses & ~new_crosses or old_naughts & ~new_naughts:
+            return False
+        added = {Mark.CROSS: new_crosses & ~old_crosses, Mark.NAUGHT: new_naughts & ~old_naughts}
+        node, mark = self.root, old.current_mark
+        while added[Mark.CROSS] or added[Mark.NAUGHT]:
+            cells = added[mark]
+            child = next((child for cell, child in node.children.items() if cells >> cell & 1), None)
+            if child is None:
+                return False
+            added[mark] &= ~(1 << child.cell)
+            node, mark = child, mark.other
+        self.game_state, self.root = game_state, node
+        return True
+
+    # for choosing the most visited move after running playouts until the
+    # budget is spent, a pool plays the leaves out in batches across its
+    # workers, stats are filled in when given
+    def search(self, budget: SearchBudget = DEFAULT_BUDGET, pool: SearchPool | None = None, stats: SearchStats | None = None) -> Move | None:
+        if self.game_state.game_over:
+            return None
+        start = time.perf_counter()
+        deadline = start + budget.seconds if budget.seconds is not None else None
+        iterations = budget.nodes if budget.nodes is not None or deadline is not None else DEFAULT_BUDGET.nodes
+        batch_size = pool.workers * LEAVES_PER_WORKER if pool is not None else 1
+        board = SearchBoard(self.game_state)
+        totals = SearchStats()
+        done = 0
+        # a move is always expanded, so there is one to return whatever the budget
+        while not self.root.children or not (
+            (iterations is not None and done >= iterations)
+            or (deadline is not None and time.perf_counter() > deadline)
+        ):
+            count = batch_size if iterations is None else max(1, min(batch_size, iterations - done))
+            if pool is None:
+                self.iterate(board, totals)
+            else:
+                self.iterate_batch(board, count, pool, totals)
+            done += count
+
+        if stats is not None:
+            totals.elapsed_seconds = time.perf_counter() - start
+            stats.update_from(totals)
+        cell = max(self.root.children.values(), key=lambda child: child.visits).cell
+        return self.game_state.make_move_to(cell)
+
+    # one iteration: select, expand, play out and back up
+    def iterate(self, board: SearchBoard, stats: SearchStats) -> None:
+        path = self.select(board, stats)
+        winner = board.winner if board.game_over else play_out(board)
+        self.back_up(path, winner)
+        self.take_back(board, path)
+        stats.leaves += 1
+
+    # count iterations whose leaves are played out together in the pool, every
+    # selected path counts as visited at once (a virtual loss) so the batch
+    # spreads over different leaves
+    def iterate_batch(self, board: SearchBoard, count: int, pool: SearchPool, stats: SearchStats) -> None:
+        pending = []
+        for _ in range(count):
+            path = self.select(board, stats)
+            if board.game_over:
+                self.back_up(path, board.winner)
+            else:
+                pending.append((path, board.to_game_state()))
+            self.take_back(board, path)
+        stats.leaves += count
+        if not pending:
+            return
+        chunk = math.ceil(len(pending) / pool.workers)
+        futures = [
+            pool.executor.submit(play_out_batch, [position for _, position in pending[first:first + chunk]], random.getrandbits(64))
+            for first in range(0, len(pending), chunk)
+        ]
+        winners = [winner for future in futures for winner in future.result()]
+        for (path, _), winner in zip(pending, winners):
+            self.back_up(path, winner)
+
+    # for walking down the tree by UCT and expanding one untried move, the
+    # moves are made on the board and every node on the path is visited
+    def select(self, board: SearchBoard, stats: SearchStats) -> list[Node]:
+        node = self.root
+        node.visits += 1
+        path = [node]
+        while not node.untried and node.children:
+            node = node.select_child()
+            board.make(node.cell)
+            node.visits += 1
+            path.append(node)
+        if node.untried:
+            cell = node.untried.pop(random.randrange(len(node.untried)))
+            board.make(cell)
+            child = node.children[cell] = Node(cell, board.possible_cells)
+            child.visits += 1
+            path.append(child)
+            stats.nodes += 1
+        stats.max_depth = max(stats.max_depth, len(path) - 1)
+        return path
+
+    # for adding the result of a playout to every node on the path, for the
+    # mark that moved into the node (the root was moved into by the other one)
+    def back_up(self, path: list[Node], winner: Mark | None) -> None:
+        mark = self.game_state.current_mark.other
+        for node in path:
+            node.reward += REWARDS[winner, mark]
+            mark = mark.other
+
+    def take_back(self, board: SearchBoard, path: list[Node]) -> None:
+        for node in reversed(path[1:]):
+            board.unmake(node.cell)
@@ -1,76 +1,289 @@
-from functools import partial
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field, fields
+from typing import Callable
+from tic_tac_toe.logic.bitboard import DEFAULT_GEOMETRY
+from tic_tac_toe.logic.exceptions import SearchBudgetExceeded, SearchCancelled
 from tic_tac_toe.logic.models import GameState, Mark, Move
+from tic_tac_toe.logic.ordering import MoveOrdering
+from tic_tac_toe.logic.search_board import SearchBoard
+from tic_tac_toe.logic.symmetry import canonical_key
+from tic_tac_toe.logic.transposition import Bound, TranspositionTable
 
+# how many plies each search looks ahead
+MINIMAX_DEPTH = 4
+REVERSE_MINIMAX_DEPTH = 5
 
-def minimax(game_state: GameState, maximizer: Mark, is_maximizing: bool, depth: int = 0, alpha: float = float('-inf'), beta: float = float('inf')) -> int:
-    if depth >= 4 or game_state.game_over:
-        return game_state.evaluate_score(maximizer)
 
-    if is_maximizing:
+# how much a single decision may spend when searching deeper and deeper
+@dataclass(frozen=True)
+class SearchBudget:
+    seconds: float | None = None
+    nodes: int | None = None
+
+
+# the state shared by every node of one search
+@dataclass
+class SearchContext:
+    table: TranspositionTable | None = None
+    symmetric: bool = False
+    ordering: MoveOrdering = field(default_factory=MoveOrdering)
+    heuristic: Callable[[GameState, Mark], int] | None = None
+    # scores the last ply of the default evaluator as one numpy batch, with at
+    # most 15 children per batch this is slower than the scalar search here
+    # (only 4x4 boards are batched, other sizes always use the scalar search)
+    batch_leaves: bool = False
+    deadline: float | None = None
+    node_limit: int | None = None
+    # set from another thread to call the search off
+    cancel: threading.Event | None = None
+    nodes: int = 0
+    cutoffs: int = 0
+    leaves: int = 0
+    # the deepest ply below the root that was evaluated
+    max_depth: int = 0
+    ply_cutoffs: defaultdict[int, int] = field(default_factory=lambda: defaultdict(int))
+
+    # for counting a node and stopping the search once the budget is spent
+    def visit(self) -> None:
+        self.nodes += 1
+        if self.node_limit is not None and self.nodes > self.node_limit:
+            raise SearchBudgetExceeded("Node budget exceeded")
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SearchBudgetExceeded("Time budget exceeded")
+        if self.cancel is not None and self.cancel.is_set():
+            raise SearchCancelled("Search cancelled")
+
+    # for counting a leaf, ply is its distance from the root
+    def leaf(self, ply: int) -> None:
+        self.leaves += 1
+        if ply > self.max_depth:
+            self.max_depth = ply
+
+
+# what one decision cost, filled in by find_best_move and find_worst_move
+@dataclass
+class SearchStats:
+    nodes: int = 0
+    leaves: int = 0
+    # alpha-beta cutoffs keyed by the ply they happened at
+    cutoffs: dict[int, int] = field(default_factory=dict)
+    max_depth: int = 0
+    table_hits: int = 0
+    table_misses: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def total_cutoffs(self) -> int:
+        return sum(self.cutoffs.values())
+
+    @property
+    def hit_rate(self) -> float:
+        probes = self.table_hits + self.table_misses
+        return self.table_hits / probes if probes else 0.0
+
+    # for adding the counts of a search that ran next to this one (the
+    # elapsed time is not added, the searches overlap)
+    def merge(self, other: "SearchStats") -> None:
+        self.nodes += other.nodes
+        self.leaves += other.leaves
+        for ply, count in other.cutoffs.items():
+            self.cutoffs[ply] = self.cutoffs.get(ply, 0) + count
+        self.max_depth = max(self.max_depth, other.max_depth)
+        self.table_hits += other.table_hits
+        self.table_misses += other.table_misses
+
+    # for filling in the stats a caller passed with those of a finished search
+    def update_from(self, other: "SearchStats") -> None:
+        for stat in fields(self):
+            value = getattr(other, stat.name)
+            setattr(self, stat.name, dict(value) if isinstance(value, dict) else value)
+
+    # for the counts of a finished search, given the table counters from before it
+    @classmethod
+    def from_context(cls, context: SearchContext, hits: int = 0, misses: int = 0, elapsed_seconds: float = 0.0) -> "SearchStats":
+        table = context.table
+        return cls(
+            nodes=context.nodes,
+            leaves=context.leaves,
+            cutoffs=dict(sorted(context.ply_cutoffs.items())),
+            max_depth=context.max_depth,
+            table_hits=table.hits - hits if table is not None else 0,
+            table_misses=table.misses - misses if table is not None else 0,
+            elapsed_seconds=elapsed_seconds,
+        )
+
+
+def minimax(game_state: GameState, maximizer: Mark, is_maximizing: bool, depth: int = 0, alpha: float = float('-inf'), beta: float = float('inf'), table: TranspositionTable | None = None, symmetric: bool = False) -> int:
+    context = SearchContext(table, symmetric)
+    return alphabeta(game_state, maximizer, is_maximizing, MINIMAX_DEPTH - depth, alpha, beta, context)
+
+def reverse_minimax(game_state: GameState, minimizer: Mark, is_minimizing: bool, depth: int = 0, alpha: float = float('-inf'), beta: float = float('inf'), table: TranspositionTable | None = None, symmetric: bool = False) -> int:
+    context = SearchContext(table, symmetric)
+    return alphabeta(game_state, minimizer, not is_minimizing, REVERSE_MINIMAX_DEPTH - depth, alpha, beta, context)
+
+# the key of a position in the transposition table, symmetric positions
+# share one key when the search treats them as equivalent, the size and win
+# length keep the boards of different geometries apart in a shared table
+def position_key(board: SearchBoard, mark: Mark, is_maximizing: bool, remaining_depth: int, symmetric: bool = False) -> tuple:
+    geometry = board.geometry
+    if symmetric:
+        crosses, naughts = canonical_key(board.bitboard, geometry.size)
+    else:
+        crosses, naughts = board.crosses, board.naughts
+    return (crosses, naughts, geometry.size, geometry.win_length, board.current_mark, mark, is_maximizing, remaining_depth)
+
+# the shared alpha-beta search behind minimax and reverse_minimax
+#
+# symmetric=True lets rotated and mirrored positions share table entries and
+# root results. This is exact with the default line_evaluation, the original
+# evaluation_function reads the lines in a fixed order and is not symmetric.
+def alphabeta(game_state: GameState, mark: Mark, is_maximizing: bool, remaining_depth: int, alpha: float = float('-inf'), beta: float = float('inf'), context: SearchContext | None = None) -> int:
+    if context is None:
+        context = SearchContext()
+    return search_board(SearchBoard(game_state), mark, is_maximizing, remaining_depth, alpha, beta, context)
+
+# alphabeta on a search board, every move is made and taken back on the same
+# board so no game states are built below the root
+def search_board(board: SearchBoard, mark: Mark, is_maximizing: bool, remaining_depth: int, alpha: float, beta: float, context: SearchContext) -> int:
+    context.visit()
+    if remaining_depth <= 0 or board.game_over:
+        context.leaf(board.ply)
+        return board.evaluate_score(mark, context.heuristic)
+
+    table = context.table
+    if table is not None:
+        key = position_key(board, mark, is_maximizing, remaining_depth, context.symmetric)
+        if entry := table.get(key):
+            if entry.bound is Bound.EXACT:
+                return entry.score
+            elif entry.bound is Bound.LOWER:
+                alpha = max(alpha, entry.score)
+            else:
+                beta = min(beta, entry.score)
+            if alpha >= beta:
+                return entry.score
+        # the window actually searched decides what the result is worth
+        window = (alpha, beta)
+
+    best_index = None
+    cutoff = False
+    if context.batch_leaves and remaining_depth == 1 and context.heuristic is None and board.geometry == DEFAULT_GEOMETRY:
+        best_index, best_score = search_last_ply(board, mark, is_maximizing, context)
+    elif is_maximizing:
         best_score = float('-inf')
-        for move in game_state.possible_moves:
-            score = minimax(move.after_state, maximizer, False, depth + 1, alpha, beta)
-            best_score = max(best_score, score)
+        for index in context.ordering.order(board, is_maximizing):
+            board.make(index)
+            score = search_board(board, mark, False, remaining_depth - 1, alpha, beta, context)
+            board.unmake(index)
+            if score > best_score:
+                best_score, best_index = score, index
             alpha = max(alpha, best_score)
             if alpha >= beta:
+                cutoff = True
                 break
-        return best_score
     else:
         best_score = float('inf')
-        for move in game_state.possible_moves:
-            score = minimax(move.after_state, maximizer, True, depth + 1, alpha, beta)
-            best_score = min(best_score, score)
+        for index in context.ordering.order(board, is_maximizing):
+            board.make(index)
+            score = search_board(board, mark, True, remaining_depth - 1, alpha, beta, context)
+            board.unmake(index)
+            if score < best_score:
+                best_score, best_index = score, index
             beta = min(beta, best_score)
             if alpha >= beta:
+                cutoff = True
                 break
-        return best_score
-    
-def reverse_minimax(game_state: GameState, minimizer: Mark, is_minimizing: bool, depth: int = 0, alpha: float = float('-inf'), beta: float = float('inf')) -> int:
-    if depth >= 5 or game_state.game_over:
-        return game_state.evaluate_score(minimizer)
-    
-    if is_minimizing:
-        worst_score = float('inf')
-        for move in game_state.possible_moves:
-            current_score = reverse_minimax(move.after_state, minimizer, False, depth + 1, alpha, beta)
-            worst_score = min(worst_score, current_score)
-            if worst_score >= beta:
-                break
-            beta = min(worst_score, beta)
-        return worst_score
-    else:
-        best_score = float('-inf')
-        for move in game_state.possible_moves:
-            current_score = reverse_minimax(move.after_state, minimizer, True, depth + 1, alpha, beta)
-            best_score = max(best_score, current_score)
-            alpha = max(alpha, best_score)
-            if alpha >= beta:
-                break
-        return best_score
-def find_best_move(game_state: GameState, mark: Mark) -> Move:
-    # maximizer = game_state.current_mark
-    maximizer = mark
-    best_score = float('-inf')
-    best_move = None
 
-    for move in game_state.possible_moves:
-        score = minimax(move.after_state, maximizer, False)
-        if score > best_score:
-            best_score = score
-            best_move = move
+    if cutoff:
+        context.cutoffs += 1
+        context.ply_cutoffs[board.ply] += 1
+    context.ordering.record(board, is_maximizing, best_index, remaining_depth, cutoff)
 
-    return best_move
+    if table is not None:
+        if best_score <= window[0]:
+            table.store(key, best_score, Bound.UPPER)
+        elif best_score >= window[1]:
+            table.store(key, best_score, Bound.LOWER)
+        else:
+            table.store(key, best_score, Bound.EXACT)
+    return best_score
 
-def find_worst_move(game_state: GameState, mark: Mark) -> Move:
-    # minimizer = game_state.current_mark
-    minimizer = mark
-    worst_score = float('inf')
-    worst_move = None
+# for scoring all the leaves below a board at once, every leaf is searched
+# so there are no cutoffs, returns the best cell and its score
+def search_last_ply(board: SearchBoard, mark: Mark, is_maximizing: bool, context: SearchContext) -> tuple[int, int]:
+    # numpy is only needed once batching is turned on
+    from tic_tac_toe.logic.batch import evaluate_children
+
+    cells, scores = evaluate_children(board, mark)
+    for _ in cells:
+        context.visit()
+        context.leaf(board.ply + 1)
+    position = scores.argmax() if is_maximizing else scores.argmin()
+    return cells[position], int(scores[position])
 
-    for move in game_state.possible_moves:
-        score = reverse_minimax(move.after_state, minimizer, True)
-        if score < worst_score:
-            worst_score = score
-            worst_move = move
+# for scoring every root move to the given depth (equivalent moves are only
+# searched once) and picking the highest or lowest scoring one
+def search_root(game_state: GameState, mark: Mark, remaining_depth: int, context: SearchContext, maximize: bool) -> Move | None:
+    chosen_score = float('-inf') if maximize else float('inf')
+    chosen_index = None
+    scores = {}
+    # a board left half way by a spent budget is simply dropped
+    board = SearchBoard(game_state)
 
-    return worst_move
\ No newline at end of file
+    for index in board.possible_cells:
+        board.make(index)
+        key = canonical_key(board.bitboard, board.geometry.size) if context.symmetric else index
+        if key not in scores:
+            scores[key] = search_board(board, mark, False, remaining_depth, float('-inf'), float('inf'), context)
+        board.unmake(index)
+        score = scores[key]
+        if (score > chosen_score) if maximize else (score < chosen_score):
+            chosen_score = score
+            chosen_index = index
+
+    if chosen_index is None:
+        return None
+    # only the chosen move is turned back into a game state
+    return game_state.make_move_to(chosen_index)
+
+# for searching one ply deeper at a time until the budget runs out, returns
+# the move of the deepest search that completed
+def search_deepening(game_state: GameState, mark: Mark, context: SearchContext, maximize: bool, budget: SearchBudget) -> Move | None:
+    # a static look at the root moves always completes, so there is a move to return
+    chosen_move = search_root(game_state, mark, 0, context, maximize)
+
+    if budget.seconds is not None:
+        context.deadline = time.perf_counter() + budget.seconds
+    context.node_limit = budget.nodes
+    # after a root move there are empty_count - 1 plies left in the game
+    for remaining_depth in range(1, game_state.grid.empty_count):
+        try:
+            chosen_move = search_root(game_state, mark, remaining_depth, context, maximize)
+        except SearchBudgetExceeded:
+            break
+    return chosen_move
+
+# the search behind find_best_move and find_worst_move, fills in stats when given
+def find_move(game_state: GameState, mark: Mark, context: SearchContext, maximize: bool, budget: SearchBudget | None, stats: SearchStats | None) -> Move:
+    table = context.table
+    hits, misses = (table.hits, table.misses) if table is not None else (0, 0)
+    start = time.perf_counter()
+    if budget is None:
+        move = search_root(game_state, mark, MINIMAX_DEPTH if maximize else REVERSE_MINIMAX_DEPTH, context, maximize)
+    else:
+        move = search_deepening(game_state, mark, context, maximize, budget)
+    if stats is not None:
+        stats.update_from(SearchStats.from_context(context, hits, misses, time.perf_counter() - start))
+    return move
+
+def find_best_move(game_state: GameState, mark: Mark, table: TranspositionTable | None = None, symmetric: bool = False, budget: SearchBudget | None = None, ordering: MoveOrdering | None = None, heuristic: Callable[[GameState, Mark], int] | None = None, batch_leaves: bool = False, stats: SearchStats | None = None, cancel: threading.Event | None = None) -> Move:
+    # maximizer = game_state.current_mark
+    context = SearchContext(table, symmetric, ordering or MoveOrdering(), heuristic, batch_leaves, cancel=cancel)
+    return find_move(game_state, mark, context, True, budget, stats)
+
+def find_worst_move(game_state: GameState, mark: Mark, table: TranspositionTable | None = None, symmetric: bool = False, budget: SearchBudget | None = None, ordering: MoveOrdering | None = None, heuristic: Callable[[GameState, Mark], int] | None = None, batch_leaves: bool = False, stats: SearchStats | None = None, cancel: threading.Event | None = None) -> Move:
+    # minimizer = game_state.current_mark
+    context = SearchContext(table, symmetric, ordering or MoveOrdering(), heuristic, batch_leaves, cancel=cancel)
+    return find_move(game_state, mark, context, False, budget, stats)
@@ -1,13 +1,21 @@
 import enum
-import re
+import os
 import random
 from dataclasses import dataclass
 from functools import cached_property
+from math import isqrt
+from typing import Callable
+from tic_tac_toe.logic.bitboard import DEFAULT_GEOMETRY, SIZE, Bitboard, BoardGeometry, board_geometry, iter_bits
+from tic_tac_toe.logic.evaluation import evaluate_lines
 from tic_tac_toe.logic.exceptions import InvalidMove, UnknownGameScore
 from tic_tac_toe.logic.exceptions import InvalidMove
 from tic_tac_toe.logic.validators import validate_game_state, validate_grid 
 
-# the winning patterns
+# states built by the engine from legal moves skip validation, set
+# TIC_TAC_TOE_DEBUG=1 (or flip this at runtime) to check them all again
+VALIDATE_TRUSTED_STATES = bool(os.environ.get("TIC_TAC_TOE_DEBUG"))
+
+# the winning patterns of the default 4x4 board
 WINNING_PATTERNS = (
     "????............",
     "....????........",
@@ -32,27 +40,67 @@ class Mark(str, enum.Enum):
 # creating the board  
 @dataclass(frozen=True)
 class Grid:
-    # creating the board cells
-    cells: str = " " * 16
+    # creating the board cells, row by row on a square board (4x4 by default)
+    cells: str = " " * DEFAULT_GEOMETRY.cell_count
+    # the marks in a row that win, None for the whole side of the board
+    win_length: int | None = None
 
     # for error checking to make sure valid data
     def __post_init__(self) -> None:
         validate_grid(self)
+        # so grids with the same rules compare equal however they were made
+        if self.win_length is None:
+            object.__setattr__(self, "win_length", isqrt(len(self.cells)))
+
+    # for an empty board of any size
+    @classmethod
+    def empty_board(cls, size: int = SIZE, win_length: int | None = None) -> "Grid":
+        return cls(" " * (size * size), win_length)
+
+    # for building a grid straight from the bitboard representation
+    @classmethod
+    def from_bitboard(cls, bitboard: Bitboard, geometry: BoardGeometry = DEFAULT_GEOMETRY) -> "Grid":
+        grid = cls(geometry.cells(bitboard), geometry.win_length)
+        grid.__dict__.update(bitboard=bitboard, geometry=geometry)
+        return grid
+
+    # for grids the engine derived from a valid one, skips validation
+    @classmethod
+    def _trusted(cls, cells: str, bitboard: Bitboard, geometry: BoardGeometry) -> "Grid":
+        if VALIDATE_TRUSTED_STATES:
+            return cls.from_bitboard(bitboard, geometry)
+        grid = object.__new__(cls)
+        grid.__dict__.update(cells=cells, win_length=geometry.win_length, bitboard=bitboard, geometry=geometry)
+        return grid
+
+    # the size and win length, with the masks and tables generated for them
+    @cached_property
+    def geometry(self) -> BoardGeometry:
+        return board_geometry(isqrt(len(self.cells)), self.win_length)
+
+    @property
+    def size(self) -> int:
+        return self.geometry.size
+
+    # the board as two integers, one per mark
+    @cached_property
+    def bitboard(self) -> Bitboard:
+        return Bitboard.from_cells(self.cells)
     
     # determining the number of Xs on the board
     @cached_property
     def x_count(self) -> int:
-        return self.cells.count("X")
+        return self.bitboard.crosses.bit_count()
     
     # determining the number of Os on the board
     @cached_property
     def o_count(self) -> int:
-        return self.cells.count("O")
+        return self.bitboard.naughts.bit_count()
     
     # determining the number of available spaces on the board
     @cached_property
     def empty_count(self) -> int:
-        return self.cells.count(" ")
+        return self.geometry.empty(self.bitboard).bit_count()
     
 # for carrying the information of the game
 @dataclass(frozen=True)
@@ -71,6 +119,15 @@ class GameState:
     def __post_init__(self) -> None:
         validate_game_state(self)
 
+    # for states the engine reached through a legal move, skips validation
+    @classmethod
+    def _trusted(cls, grid: Grid, starting_mark: Mark) -> "GameState":
+        if VALIDATE_TRUSTED_STATES:
+            return cls(grid, starting_mark)
+        game_state = object.__new__(cls)
+        game_state.__dict__.update(grid=grid, starting_mark=starting_mark)
+        return game_state
+
     # returns who will make the next move
     @cached_property
     def current_mark(self) -> Mark:
@@ -82,7 +139,7 @@ class GameState:
     # for determining if the game has started
     @cached_property
     def game_not_started(self) -> bool:
-        return self.grid.empty_count == 16
+        return self.grid.empty_count == self.grid.geometry.cell_count
     
     # for determining if the game is over
     @cached_property
@@ -92,37 +149,38 @@ class GameState:
     # for determining if there is a tie (see if all squares are full)
     @cached_property
     def tie(self) -> bool:
-        return self.winner is None and self.grid.empty_count == 0
+        return self.winner is None and self.grid.bitboard.occupied == self.grid.geometry.full_mask
+
+    # for finding the completed line (if any) through the win masks
+    @cached_property
+    def winning_line(self) -> tuple[str, int] | None:
+        return self.grid.geometry.winning_line(self.grid.bitboard)
 
     # for determining if either player won
     @cached_property
     def winner(self) -> Mark | None:
-        for pattern in WINNING_PATTERNS:
-            for mark in Mark:
-                if re.match(pattern.replace("?", mark), self.grid.cells):
-                    return mark
+        if self.winning_line:
+            return Mark(self.winning_line[0])
         return None
     
     # for determining what the winning cells were
     @cached_property
     def winning_cells(self) -> list[int]:
-        for pattern in WINNING_PATTERNS:
-            for mark in Mark:
-                if re.match(pattern.replace("?", mark), self.grid.cells):
-                    return [
-                        match.start()
-                        for match in re.finditer(r"\?", pattern)
-                    ]
+        if self.winning_line:
+            return list(iter_bits(self.winning_line[1]))
         return []
     
+    # for determining the empty cells that can be played, without building any moves
+    @cached_property
+    def possible_cells(self) -> list[int]:
+        if self.game_over:
+            return []
+        return list(iter_bits(self.grid.geometry.empty(self.grid.bitboard)))
+
     # for determining the possible moves
     @cached_property
     def possible_moves(self) -> list[Move]:
-        moves = []
-        if not self.game_over:
-            for match in re.finditer(r"\s", self.grid.cells):
-                moves.append(self.make_move_to(match.start()))
-        return moves
+        return [self.make_move_to(index) for index in self.possible_cells]
     
     # to allow for the AI to make a random move (initially)
     def make_random_move(self) -> Move | None:
@@ -133,24 +191,36 @@ class GameState:
     
     # for making a move
     def make_move_to(self, index: int) -> Move:
-        if self.grid.cells[index] != " ":
-            raise InvalidMove("Cell is not empty")
         return Move(
             mark=self.current_mark,
             cell_index=index,
             before_state=self,
-            after_state=GameState(
-                Grid(
-                    self.grid.cells[:index]
-                    + self.current_mark
-                    + self.grid.cells[index + 1:]
-                ),
-                self.starting_mark,
+            after_state=self.after_move_to(index),
+        )
+
+    # for building only the state that follows a move (used by the search),
+    # the move is checked here so the new state can skip validation
+    def after_move_to(self, index: int) -> "GameState":
+        if not 0 <= index < self.grid.geometry.cell_count:
+            raise InvalidMove("Cell index is out of range")
+        if self.game_over:
+            raise InvalidMove("Game is already over")
+        if self.grid.bitboard.occupied >> index & 1:
+            raise InvalidMove("Cell is not empty")
+        return GameState._trusted(
+            Grid._trusted(
+                self.grid.cells[:index]
+                + self.current_mark
+                + self.grid.cells[index + 1:],
+                self.grid.bitboard.place(index, self.current_mark),
+                self.grid.geometry,
             ),
+            self.starting_mark,
         )
     
-    # for the minimax algorithm
-    def evaluate_score(self, mark: Mark) -> int:
+    # for the minimax algorithm, the heuristic scores unfinished games
+    # (line_evaluation unless another one is given)
+    def evaluate_score(self, mark: Mark, heuristic: Callable[["GameState", Mark], int] | None = None) -> int:
         if self.tie and mark == "X":
             return 2 # tie is the goal
         elif self.tie and mark == "O":
@@ -163,9 +233,16 @@ class GameState:
             return -1 # don't want to lose
         elif self.winner == mark.other and mark == "O":
             return -2 # don't want to lose
+        elif heuristic is not None:
+            return heuristic(self, mark)
         else:
-            return self.evaluation_function(mark)
-        
+            return self.line_evaluation(mark)
+
+    # scores each line from a precomputed table and adds them up
+    def line_evaluation(self, mark: Mark) -> int:
+        return evaluate_lines(self.grid.bitboard, mark, self.grid.geometry)
+
+    # the original evaluator, kept selectable for comparison (4x4 boards only)
     def evaluation_function(self, mark: Mark) -> int:
         index = 0
         while index < 16:
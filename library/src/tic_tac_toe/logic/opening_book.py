@@ -0,0 +1,122 @@
+"""Opening book with the searched replies for the first plies of the game.
+
+Build it with:
+
+    python -m tic_tac_toe.logic.opening_book [--plies N] [path]
+"""
+import argparse
+import struct
+from functools import lru_cache
+from pathlib import Path
+
+from tic_tac_toe.logic.bitboard import DEFAULT_GEOMETRY
+from tic_tac_toe.logic.minimax import find_best_move, find_worst_move
+from tic_tac_toe.logic.models import GameState, Grid, Mark, Move
+from tic_tac_toe.logic.symmetry import canonical_grid, canonicalize, from_canonical
+from tic_tac_toe.logic.transposition import TranspositionTable
+
+DEFAULT_PATH = Path(__file__).parent / "data" / "opening_book.bin"
+DEFAULT_PLIES = 4
+
+MAGIC = b"TTOB"
+# version 2 holds replies searched with line_evaluation
+VERSION = 2
+HEADER = struct.Struct("<4sBBI")
+# crosses, naughts, side to move (0 for X), best cell, worst cell
+RECORD = struct.Struct("<HHBBB")
+NO_MOVE = 0xFF
+
+
+# the replies of the book for one symmetry class of positions
+class OpeningBook:
+    def __init__(self, entries: dict[tuple[int, int, int], tuple[int, int]] | None = None) -> None:
+        self.entries = entries or {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _lookup(self, game_state: GameState, mark: Mark, slot: int) -> Move | None:
+        # the book only covers the default 4x4 board, searched for the side
+        # to move (a search for the other mark scores the moves differently)
+        if game_state.grid.geometry != DEFAULT_GEOMETRY or mark is not game_state.current_mark:
+            return None
+        canonical, symmetry = canonicalize(game_state.grid.bitboard)
+        entry = self.entries.get((*canonical, game_state.current_mark == "O"))
+        if entry is None or entry[slot] == NO_MOVE:
+            return None
+        return game_state.make_move_to(from_canonical(entry[slot], symmetry))
+
+    # the replies find_best_move and find_worst_move give for the mark
+    def best_move(self, game_state: GameState, mark: Mark) -> Move | None:
+        return self._lookup(game_state, mark, 0)
+
+    def worst_move(self, game_state: GameState, mark: Mark) -> Move | None:
+        return self._lookup(game_state, mark, 1)
+
+
+# for searching every symmetry class of the first plies with either starting
+# mark, storing the replies as cells of the canonical board
+def build(plies: int = DEFAULT_PLIES) -> OpeningBook:
+    entries = {}
+    table = TranspositionTable()
+    frontier = [GameState(Grid(), mark) for mark in Mark]
+    for _ in range(plies):
+        next_frontier = {}
+        for game_state in frontier:
+            if game_state.game_over:
+                continue
+            grid, _ = canonical_grid(game_state.grid)
+            canonical_state = GameState(grid, game_state.starting_mark)
+            mark = canonical_state.current_mark
+            best = find_best_move(canonical_state, mark, table)
+            worst = find_worst_move(canonical_state, mark, table)
+            entries[(*grid.bitboard, mark == "O")] = (best.cell_index, worst.cell_index)
+            for index in canonical_state.possible_cells:
+                child = canonical_state.make_move_to(index).after_state
+                key = (canonicalize(child.grid.bitboard)[0], child.starting_mark)
+                next_frontier.setdefault(key, child)
+        frontier = list(next_frontier.values())
+    return OpeningBook(entries)
+
+
+def save(book: OpeningBook, plies: int, path: Path = DEFAULT_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, plies, len(book)))
+        for (crosses, naughts, mover), (best, worst) in book.entries.items():
+            file.write(RECORD.pack(crosses, naughts, mover, best, worst))
+
+
+def load(path: Path = DEFAULT_PATH) -> OpeningBook:
+    data = path.read_bytes()
+    magic, version, _, count = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not a version {VERSION} opening book: {path}")
+    entries = {}
+    for crosses, naughts, mover, best, worst in RECORD.iter_unpack(data[HEADER.size:HEADER.size + count * RECORD.size]):
+        entries[(crosses, naughts, mover)] = (best, worst)
+    return OpeningBook(entries)
+
+
+# the book used by the computer players, read from disk on first use only
+# (an empty book when none has been built)
+@lru_cache(maxsize=None)
+def shared_book(path: Path = DEFAULT_PATH) -> OpeningBook:
+    try:
+        return load(path)
+    except FileNotFoundError:
+        return OpeningBook()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the opening book")
+    parser.add_argument("path", nargs="?", type=Path, default=DEFAULT_PATH)
+    parser.add_argument("--plies", type=int, default=DEFAULT_PLIES)
+    args = parser.parse_args()
+    book = build(args.plies)
+    save(book, args.plies, args.path)
+    print(f"Opening book with {len(book)} positions written to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
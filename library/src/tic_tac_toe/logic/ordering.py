@@ -0,0 +1,57 @@
+from collections import defaultdict
+from tic_tac_toe.logic.search_board import SearchBoard
+
+# killer moves remembered for each ply
+KILLER_SLOTS = 2
+
+
+# the order the search tries the moves of a position in (cell order by default)
+class MoveOrdering:
+    def order(self, board: SearchBoard, is_maximizing: bool) -> list[int]:
+        """Return the empty cells in the order they should be searched."""
+        return board.possible_cells
+
+    def record(self, board: SearchBoard, is_maximizing: bool, index: int, remaining_depth: int, cutoff: bool) -> None:
+        """Learn from the best move found in a searched position."""
+
+
+# tries wins, blocks, the best move found earlier, killer moves and then the
+# moves with the best history, cell order breaks the ties
+class HeuristicOrdering(MoveOrdering):
+    def __init__(self) -> None:
+        self.best_moves: dict[tuple, int] = {}
+        self.killers: defaultdict[int, list[int]] = defaultdict(list)
+        self.history: defaultdict[tuple[str, int], int] = defaultdict(int)
+
+    def order(self, board: SearchBoard, is_maximizing: bool) -> list[int]:
+        bitboard = board.bitboard
+        mark = board.current_mark
+        own = bitboard.mark_bits(mark)
+        other = bitboard.mark_bits(mark.other)
+        best_move = self.best_moves.get((*bitboard, is_maximizing))
+        killers = self.killers[bitboard.occupied.bit_count()]
+        completes_line = board.geometry.completes_line
+
+        def rank(index: int) -> tuple[int, int]:
+            if completes_line(own, index):
+                return 0, 0
+            if completes_line(other, index):
+                return 1, 0
+            if index == best_move:
+                return 2, 0
+            if index in killers:
+                return 3, killers.index(index)
+            return 4, -self.history[mark, index]
+
+        return sorted(board.possible_cells, key=rank)
+
+    def record(self, board: SearchBoard, is_maximizing: bool, index: int, remaining_depth: int, cutoff: bool) -> None:
+        bitboard = board.bitboard
+        self.best_moves[(*bitboard, is_maximizing)] = index
+        if cutoff:
+            # the board fills one cell per ply, so the count of marks is the ply
+            killers = self.killers[bitboard.occupied.bit_count()]
+            if index not in killers:
+                killers.insert(0, index)
+                del killers[KILLER_SLOTS:]
+            self.history[board.current_mark, index] += remaining_depth * remaining_depth
@@ -0,0 +1,105 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from tic_tac_toe.logic.bitboard import BoardGeometry
+from tic_tac_toe.logic.minimax import MINIMAX_DEPTH, REVERSE_MINIMAX_DEPTH, SearchContext, SearchStats, search_board
+from tic_tac_toe.logic.models import GameState, Mark, Move
+from tic_tac_toe.logic.ordering import HeuristicOrdering
+from tic_tac_toe.logic.search_board import SearchBoard
+from tic_tac_toe.logic.transposition import TranspositionTable
+
+# every worker process keeps its own table across tasks, moves and games, one
+# per board geometry as the keys only hold the bits of the marks
+_worker_tables: dict[BoardGeometry, TranspositionTable] = {}
+
+
+# runs in a worker process, scores one root move and counts what it cost
+def _score_root_move(game_state: GameState, index: int, mark: Mark, remaining_depth: int, alpha: float, beta: float) -> tuple[int, SearchStats]:
+    board = SearchBoard(game_state)
+    if (table := _worker_tables.get(board.geometry)) is None:
+        table = _worker_tables[board.geometry] = TranspositionTable()
+    context = SearchContext(table, ordering=HeuristicOrdering())
+    hits, misses = table.hits, table.misses
+    board.make(index)
+    score = search_board(board, mark, False, remaining_depth, alpha, beta, context)
+    return score, SearchStats.from_context(context, hits, misses)
+
+
+# a process pool that splits the root moves of a search between its workers,
+# the pool is started on first use and kept until it is closed
+class SearchPool:
+    def __init__(self, workers: int | None = None) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self._executor: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> "SearchPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers)
+        return self._executor
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def find_best_move(self, game_state: GameState, mark: Mark, stats: SearchStats | None = None) -> Move | None:
+        return self.search_root(game_state, mark, MINIMAX_DEPTH, maximize=True, stats=stats)
+
+    def find_worst_move(self, game_state: GameState, mark: Mark, stats: SearchStats | None = None) -> Move | None:
+        return self.search_root(game_state, mark, REVERSE_MINIMAX_DEPTH, maximize=False, stats=stats)
+
+    # picks the same move as minimax.search_root: the first cell with the
+    # highest (or lowest) score, stats adds up the work of every worker
+    def search_root(self, game_state: GameState, mark: Mark, remaining_depth: int, maximize: bool, stats: SearchStats | None = None) -> Move | None:
+        start = time.perf_counter()
+        total = SearchStats()
+        cells = iter(game_state.possible_cells)
+        pending: dict[Future, int] = {}
+        scores: dict[int, int] = {}
+        bound = float('-inf') if maximize else float('inf')
+
+        def submit(index: int) -> None:
+            # moves that can no longer be chosen only need to prove it, the
+            # bound stays one short of the best score so ties keep cell order
+            if maximize:
+                alpha, beta = bound - 1, float('inf')
+            else:
+                alpha, beta = float('-inf'), bound + 1
+            future = self.executor.submit(_score_root_move, game_state, index, mark, remaining_depth, alpha, beta)
+            pending[future] = index
+
+        for index in cells:
+            submit(index)
+            if len(pending) == self.workers:
+                break
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                score, move_stats = future.result()
+                scores[pending.pop(future)] = score
+                total.merge(move_stats)
+                bound = max(bound, score) if maximize else min(bound, score)
+                if (index := next(cells, None)) is not None:
+                    submit(index)
+
+        chosen_score = float('-inf') if maximize else float('inf')
+        chosen_index = None
+        for index in game_state.possible_cells:
+            score = scores[index]
+            if (score > chosen_score) if maximize else (score < chosen_score):
+                chosen_score = score
+                chosen_index = index
+        if stats is not None:
+            total.cutoffs = dict(sorted(total.cutoffs.items()))
+            total.elapsed_seconds = time.perf_counter() - start
+            stats.update_from(total)
+        if chosen_index is None:
+            return None
+        return game_state.make_move_to(chosen_index)
@@ -0,0 +1,117 @@
+"""Count the positions move generation reaches at every ply (perft).
+
+The counts only depend on the rules, so they check possible_moves and
+make_move_to after the board representation changes, and the time taken
+measures move generation apart from the evaluation:
+
+    python -m tic_tac_toe.logic.perft [--depth N] [--size N] [--win-length K] [--memoize]
+"""
+import argparse
+import time
+from dataclasses import dataclass
+
+from tic_tac_toe.logic.models import GameState, Grid, Mark
+from tic_tac_toe.logic.symmetry import canonical_key
+
+DEFAULT_DEPTH = 4
+
+# the counts of the plies below one symmetry class of positions, keyed by
+# its canonical bitboard and the depth searched
+PerftTable = dict[tuple[int, int, int], tuple[tuple[int, int, int, int], ...]]
+
+
+# the positions reached at one ply, the games won and tied on it are
+# counted among them and not played on
+@dataclass
+class PerftCounts:
+    positions: int = 0
+    x_wins: int = 0
+    o_wins: int = 0
+    ties: int = 0
+
+    @property
+    def wins(self) -> int:
+        return self.x_wins + self.o_wins
+
+
+# for the counts of plies 1 to depth below the game state, with a table the
+# subtrees of positions that are rotations or reflections of each other are
+# counted once (use a table for one board and starting mark only)
+def perft(game_state: GameState, depth: int, table: PerftTable | None = None) -> list[PerftCounts]:
+    if table is None:
+        counts = [PerftCounts() for _ in range(depth)]
+        _count(game_state, counts, 0)
+        return counts
+    return [PerftCounts(*ply) for ply in _count_memoized(game_state, depth, table)]
+
+
+def _count(game_state: GameState, counts: list[PerftCounts], ply: int) -> None:
+    ply_counts = counts[ply]
+    deeper = ply + 1 < len(counts)
+    for move in game_state.possible_moves:
+        after_state = move.after_state
+        ply_counts.positions += 1
+        if (winner := after_state.winner) is Mark.CROSS:
+            ply_counts.x_wins += 1
+        elif winner is Mark.NAUGHT:
+            ply_counts.o_wins += 1
+        elif after_state.tie:
+            ply_counts.ties += 1
+        elif deeper:
+            _count(after_state, counts, ply + 1)
+
+
+def _count_memoized(game_state: GameState, depth: int, table: PerftTable) -> tuple[tuple[int, int, int, int], ...]:
+    key = (*canonical_key(game_state.grid.bitboard, game_state.grid.size), depth)
+    if (counts := table.get(key)) is not None:
+        return counts
+    totals = [[0, 0, 0, 0] for _ in range(depth)]
+    for move in game_state.possible_moves:
+        after_state = move.after_state
+        first = totals[0]
+        first[0] += 1
+        if (winner := after_state.winner) is Mark.CROSS:
+            first[1] += 1
+        elif winner is Mark.NAUGHT:
+            first[2] += 1
+        elif after_state.tie:
+            first[3] += 1
+        elif depth > 1:
+            for ply_totals, ply_counts in zip(totals[1:], _count_memoized(after_state, depth - 1, table)):
+                for column, count in enumerate(ply_counts):
+                    ply_totals[column] += count
+    counts = table[key] = tuple(tuple(ply_totals) for ply_totals in totals)
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Count the positions reached at every ply")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH, help="plies to count")
+    parser.add_argument("--size", type=int, default=4, metavar="N", help="count on an N by N board")
+    parser.add_argument("--win-length", type=int, metavar="K", help="marks in a row needed to win (the whole side of the board by default)")
+    parser.add_argument("--starting", dest="starting_mark", choices=Mark, type=Mark, default="X")
+    parser.add_argument("--memoize", action="store_true", help="count the subtrees of symmetric positions once")
+    args = parser.parse_args()
+    if args.depth < 1:
+        parser.error("--depth must be at least 1")
+
+    try:
+        game_state = GameState(Grid.empty_board(args.size, args.win_length), args.starting_mark)
+    except ValueError as ex:
+        parser.error(str(ex))
+    table: PerftTable | None = {} if args.memoize else None
+    start = time.perf_counter()
+    counts = perft(game_state, args.depth, table)
+    elapsed = time.perf_counter() - start
+
+    print(f"{'ply':>3} {'positions':>14} {'X wins':>12} {'O wins':>12} {'ties':>12}")
+    for ply, ply_counts in enumerate(counts, start=1):
+        print(f"{ply:3d} {ply_counts.positions:14,d} {ply_counts.x_wins:12,d} {ply_counts.o_wins:12,d} {ply_counts.ties:12,d}")
+    total = sum(ply_counts.positions for ply_counts in counts)
+    print(f"{total:,d} positions in {elapsed:.3f} s ({total / elapsed:,.0f} positions/s)")
+    if table is not None:
+        print(f"{len(table):,d} symmetry classes searched")
+
+
+if __name__ == "__main__":
+    main()
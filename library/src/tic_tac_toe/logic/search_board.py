@@ -0,0 +1,117 @@
+from typing import Callable
+from tic_tac_toe.logic.bitboard import Bitboard, iter_bits
+from tic_tac_toe.logic.evaluation import clamp_lines, line_tables
+from tic_tac_toe.logic.models import GameState, Grid, Mark
+
+# evaluate_score of finished games, keyed by (winner, mark) with None for a tie
+TERMINAL_SCORES = {
+    (winner, mark): game_state.evaluate_score(mark)
+    for winner, game_state in (
+        (Mark.CROSS, GameState(Grid("XXXXOOO         "), Mark.CROSS)),
+        (Mark.NAUGHT, GameState(Grid("OOOOXXX         "), Mark.NAUGHT)),
+        (None, GameState(Grid("XOXOXOXOOXOXOXOX"), Mark.CROSS)),
+    )
+    for mark in Mark
+}
+
+
+# a mutable board the search plays moves on and takes them back from, keeping
+# the winner, the number of empty cells, the line scores and the number of
+# moves made since it was set up (the ply) up to date, the tables of the
+# board's geometry are kept at hand for make and unmake
+class SearchBoard:
+    __slots__ = (
+        "crosses", "naughts", "current_mark", "starting_mark",
+        "empty_count", "winner", "line_codes", "line_total", "ply",
+        "geometry", "cell_line_weights", "line_scores", "winning_line_codes",
+    )
+
+    def __init__(self, game_state: GameState) -> None:
+        self.geometry = game_state.grid.geometry
+        tables = line_tables(self.geometry)
+        self.cell_line_weights = tables.cell_line_weights
+        self.line_scores = tables.line_scores
+        self.winning_line_codes = tables.winning_line_codes
+        self.crosses, self.naughts = game_state.grid.bitboard
+        self.current_mark = game_state.current_mark
+        self.starting_mark = game_state.starting_mark
+        self.empty_count = game_state.grid.empty_count
+        self.winner = game_state.winner
+        self.line_codes = [
+            sum(
+                3 ** position * (1 if self.crosses >> cell & 1 else 2 if self.naughts >> cell & 1 else 0)
+                for position, cell in enumerate(cells)
+            )
+            for cells in tables.line_cells
+        ]
+        self.line_total = sum(self.line_scores[code] for code in self.line_codes)
+        self.ply = 0
+
+    @property
+    def bitboard(self) -> Bitboard:
+        return Bitboard(self.crosses, self.naughts)
+
+    @property
+    def game_over(self) -> bool:
+        return self.winner is not None or self.empty_count == 0
+
+    @property
+    def possible_cells(self) -> list[int]:
+        if self.game_over:
+            return []
+        return list(iter_bits(~(self.crosses | self.naughts) & self.geometry.full_mask))
+
+    # for placing the current mark on an empty cell
+    def make(self, index: int) -> None:
+        mark = self.current_mark
+        if mark is Mark.CROSS:
+            self.crosses |= 1 << index
+            digit = 1
+        else:
+            self.naughts |= 1 << index
+            digit = 2
+        codes = self.line_codes
+        scores = self.line_scores
+        winning_code = self.winning_line_codes[digit]
+        for line, weight in self.cell_line_weights[index]:
+            old = codes[line]
+            codes[line] = new = old + digit * weight
+            self.line_total += scores[new] - scores[old]
+            if new == winning_code:
+                self.winner = mark
+        self.empty_count -= 1
+        self.ply += 1
+        self.current_mark = mark.other
+
+    # for taking back the last move, which was made on the given cell
+    def unmake(self, index: int) -> None:
+        mark = self.current_mark.other
+        if mark is Mark.CROSS:
+            self.crosses &= ~(1 << index)
+            digit = 1
+        else:
+            self.naughts &= ~(1 << index)
+            digit = 2
+        codes = self.line_codes
+        scores = self.line_scores
+        for line, weight in self.cell_line_weights[index]:
+            old = codes[line]
+            codes[line] = new = old - digit * weight
+            self.line_total += scores[new] - scores[old]
+        # the search never plays on from a finished game
+        self.winner = None
+        self.empty_count += 1
+        self.ply -= 1
+        self.current_mark = mark
+
+    # the same scores as GameState.evaluate_score
+    def evaluate_score(self, mark: Mark, heuristic: Callable[[GameState, Mark], int] | None = None) -> int:
+        if self.winner is not None or self.empty_count == 0:
+            return TERMINAL_SCORES[self.winner, mark]
+        elif heuristic is not None:
+            return heuristic(self.to_game_state(), mark)
+        else:
+            return clamp_lines(self.line_total, mark)
+
+    def to_game_state(self) -> GameState:
+        return GameState(Grid.from_bitboard(self.bitboard, self.geometry), self.starting_mark)
@@ -0,0 +1,134 @@
+from functools import lru_cache
+from typing import NamedTuple
+from tic_tac_toe.logic.bitboard import SIZE, Bitboard
+from tic_tac_toe.logic.models import Grid
+
+# the 8 rotations and reflections of the board as (row, col) -> (row, col),
+# last is the index of the last row and column
+_TRANSFORMS = (
+    lambda row, col, last: (row, col),  # identity
+    lambda row, col, last: (col, last - row),  # rotate 90 degrees
+    lambda row, col, last: (last - row, last - col),  # rotate 180 degrees
+    lambda row, col, last: (last - col, row),  # rotate 270 degrees
+    lambda row, col, last: (row, last - col),  # mirror left to right
+    lambda row, col, last: (last - row, col),  # mirror top to bottom
+    lambda row, col, last: (col, row),  # main diagonal
+    lambda row, col, last: (last - col, last - row),  # anti diagonal
+)
+
+
+# the symmetries of one board size, see symmetry_tables
+class SymmetryTables(NamedTuple):
+    # permutations[s][i] is where cell i ends up under symmetry s
+    permutations: tuple[tuple[int, ...], ...]
+    # inverse_permutations[s][i] is the cell that ends up on cell i under symmetry s
+    inverse_permutations: tuple[tuple[int, ...], ...]
+    # byte_tables[s][b] moves the bits of byte b of a bitboard under symmetry s
+    byte_tables: tuple[tuple[tuple[int, ...], ...], ...]
+
+
+# for moving the bits of one byte of a bitboard all at once
+def _byte_table(permutation: tuple[int, ...], offset: int) -> tuple[int, ...]:
+    table = []
+    for byte in range(256):
+        bits = 0
+        for bit in range(min(8, len(permutation) - offset)):
+            if byte >> bit & 1:
+                bits |= 1 << permutation[offset + bit]
+        table.append(bits)
+    return tuple(table)
+
+
+# the tables are built the first time a board size is canonicalized
+@lru_cache(maxsize=None)
+def symmetry_tables(size: int) -> SymmetryTables:
+    cell_count = size * size
+    permutations = tuple(
+        tuple(
+            row * size + col
+            for row, col in (transform(*divmod(index, size), size - 1) for index in range(cell_count))
+        )
+        for transform in _TRANSFORMS
+    )
+    return SymmetryTables(
+        permutations,
+        tuple(
+            tuple(permutation.index(index) for index in range(cell_count))
+            for permutation in permutations
+        ),
+        tuple(
+            tuple(_byte_table(permutation, offset) for offset in range(0, cell_count, 8))
+            for permutation in permutations
+        ),
+    )
+
+
+# the symmetries of the default 4x4 board
+SYMMETRIES = symmetry_tables(SIZE).permutations
+INVERSE_SYMMETRIES = symmetry_tables(SIZE).inverse_permutations
+
+
+# for applying a symmetry to the bits of one mark
+def transform_bits(bits: int, symmetry: int, size: int = SIZE) -> int:
+    return _transform_bits(bits, symmetry_tables(size).byte_tables[symmetry])
+
+
+def _transform_bits(bits: int, tables: tuple[tuple[int, ...], ...]) -> int:
+    image = 0
+    for table in tables:
+        image |= table[bits & 0xFF]
+        bits >>= 8
+    return image
+
+
+# for applying a symmetry to the whole board
+def transform(bitboard: Bitboard, symmetry: int, size: int = SIZE) -> Bitboard:
+    tables = symmetry_tables(size).byte_tables[symmetry]
+    return Bitboard(
+        _transform_bits(bitboard.crosses, tables),
+        _transform_bits(bitboard.naughts, tables),
+    )
+
+
+# for finding the representative of the symmetry class of a board, returns
+# the canonical board and the symmetry that maps the given board onto it
+def canonicalize(bitboard: Bitboard, size: int = SIZE) -> tuple[Bitboard, int]:
+    canonical, canonical_symmetry = bitboard, 0
+    for symmetry in range(1, len(_TRANSFORMS)):
+        image = transform(bitboard, symmetry, size)
+        if image < canonical:
+            canonical, canonical_symmetry = image, symmetry
+    return canonical, canonical_symmetry
+
+
+# for mapping a grid onto the representative of its symmetry class
+def canonical_grid(grid: Grid) -> tuple[Grid, int]:
+    canonical, symmetry = canonicalize(grid.bitboard, grid.size)
+    return Grid.from_bitboard(canonical, grid.geometry), symmetry
+
+
+# the canonical board alone, for keying caches
+def canonical_key(bitboard: Bitboard, size: int = SIZE) -> Bitboard:
+    crosses, naughts = bitboard
+    byte_tables = symmetry_tables(size).byte_tables
+    # the search asks at every node, boards of up to 16 cells (the default
+    # 4x4 and 3x3) fit in two bytes, so their lookups are written out
+    if size * size <= 16:
+        return min(
+            Bitboard(low[crosses & 0xFF] | high[crosses >> 8], low[naughts & 0xFF] | high[naughts >> 8])
+            for low, high in byte_tables
+        )
+    return min(
+        Bitboard(_transform_bits(crosses, tables), _transform_bits(naughts, tables))
+        for tables in byte_tables
+    )
+
+
+# for mapping a cell of the original board onto the canonical board
+def to_canonical(index: int, symmetry: int, size: int = SIZE) -> int:
+    return symmetry_tables(size).permutations[symmetry][index]
+
+
+# for mapping a cell of the canonical board back onto the original board
+def from_canonical(index: int, symmetry: int, size: int = SIZE) -> int:
+    return symmetry_tables(size).inverse_permutations[symmetry][index]
@@ -0,0 +1,187 @@
+"""Tablebase with the exact outcome of every reachable 4x4 position.
+
+Build it once (this takes a while in pure Python) with:
+
+    python -m tic_tac_toe.logic.tablebase [path]
+"""
+import enum
+import mmap
+import struct
+import sys
+from pathlib import Path
+
+from tic_tac_toe.logic.bitboard import CELL_COUNT, CELL_WIN_MASKS, DEFAULT_GEOMETRY, FULL_MASK, Bitboard
+from tic_tac_toe.logic.models import GameState, Mark, Move
+from tic_tac_toe.logic.search_board import TERMINAL_SCORES
+
+DEFAULT_PATH = Path(__file__).parent / "data" / "tablebase.bin"
+
+MAGIC = b"TTTB"
+VERSION = 1
+HEADER = struct.Struct("<4sB")
+
+# every board has a base-3 index (empty 0, X 1, O 2 per cell) and two
+# entries, one per side to move, of 2 bits each
+POSITIONS = 3 ** CELL_COUNT
+ENTRIES_PER_BYTE = 4
+DATA_SIZE = POSITIONS * 2 // ENTRIES_PER_BYTE + 1
+
+
+# the result of the game under perfect play (0 in the file means unknown)
+class Outcome(enum.IntEnum):
+    CROSS_WINS = 1
+    NAUGHT_WINS = 2
+    TIE = 3
+
+
+# base-3 weights of the bits of each byte of a bitboard
+_BYTE_WEIGHTS = tuple(
+    tuple(
+        sum(3 ** (offset + bit) for bit in range(8) if byte >> bit & 1)
+        for byte in range(256)
+    )
+    for offset in (0, 8)
+)
+
+
+def position_index(bitboard: Bitboard) -> int:
+    low, high = _BYTE_WEIGHTS
+    crosses, naughts = bitboard
+    return (
+        low[crosses & 0xFF] + high[crosses >> 8]
+        + 2 * (low[naughts & 0xFF] + high[naughts >> 8])
+    )
+
+
+def entry_number(index: int, mover: str) -> int:
+    return index * 2 + (mover == "O")
+
+
+# the winner of each outcome, None for a tie
+_WINNERS = {
+    Outcome.CROSS_WINS: Mark.CROSS,
+    Outcome.NAUGHT_WINS: Mark.NAUGHT,
+    Outcome.TIE: None,
+}
+
+
+# the score of an outcome under the project's evaluate_score semantics
+def outcome_score(outcome: Outcome, mark: Mark) -> int:
+    return TERMINAL_SCORES[_WINNERS[outcome], mark]
+
+
+# for solving every position reachable from an empty board with either
+# starting mark, working back from the finished games to the first move
+def build() -> bytearray:
+    data = bytearray(DATA_SIZE)
+    powers = tuple(3 ** cell for cell in range(CELL_COUNT))
+
+    def store(entry: int, outcome: int) -> None:
+        data[entry >> 2] |= outcome << ((entry & 3) << 1)
+
+    def solve(crosses: int, naughts: int, index: int, mover: int) -> int:
+        entry = index * 2 + mover
+        known = data[entry >> 2] >> ((entry & 3) << 1) & 3
+        if known:
+            return known
+
+        outcomes = set()
+        empty = ~(crosses | naughts) & FULL_MASK
+        while empty:
+            bit = empty & -empty
+            empty ^= bit
+            cell = bit.bit_length() - 1
+            if mover == 0:
+                own = crosses | bit
+                child_crosses, child_naughts = own, naughts
+                child_index = index + powers[cell]
+                won = Outcome.CROSS_WINS
+            else:
+                own = naughts | bit
+                child_crosses, child_naughts = crosses, own
+                child_index = index + 2 * powers[cell]
+                won = Outcome.NAUGHT_WINS
+            if any(own & mask == mask for mask in CELL_WIN_MASKS[cell]):
+                store(child_index * 2 + 1 - mover, won)
+                outcomes.add(won)
+            elif child_crosses | child_naughts == FULL_MASK:
+                store(child_index * 2 + 1 - mover, Outcome.TIE)
+                outcomes.add(Outcome.TIE)
+            else:
+                outcomes.add(solve(child_crosses, child_naughts, child_index, 1 - mover))
+
+        wins, losses = (
+            (Outcome.CROSS_WINS, Outcome.NAUGHT_WINS) if mover == 0
+            else (Outcome.NAUGHT_WINS, Outcome.CROSS_WINS)
+        )
+        if wins in outcomes:
+            outcome = wins
+        elif Outcome.TIE in outcomes:
+            outcome = Outcome.TIE
+        else:
+            outcome = losses
+        store(entry, outcome)
+        return outcome
+
+    solve(0, 0, 0, 0)
+    solve(0, 0, 0, 1)
+    return data
+
+
+def save(data: bytearray, path: Path = DEFAULT_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION))
+        file.write(data)
+
+
+# the tablebase file mapped into memory, nothing is read until it is looked up
+class Tablebase:
+    def __init__(self, path: Path = DEFAULT_PATH) -> None:
+        with open(path, "rb") as file:
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = HEADER.unpack_from(self._data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a version {VERSION} tablebase: {path}")
+        if len(self._data) != HEADER.size + DATA_SIZE:
+            raise ValueError(f"Truncated tablebase: {path}")
+
+    def close(self) -> None:
+        self._data.close()
+
+    # None for positions missing from the tablebase, and for other board sizes
+    def outcome(self, game_state: GameState) -> Outcome | None:
+        if game_state.grid.geometry != DEFAULT_GEOMETRY:
+            return None
+        entry = entry_number(position_index(game_state.grid.bitboard), game_state.current_mark)
+        code = self._data[HEADER.size + (entry >> 2)] >> ((entry & 3) << 1) & 3
+        return Outcome(code) if code else None
+
+    def score(self, game_state: GameState, mark: Mark) -> int | None:
+        if (outcome := self.outcome(game_state)) is None:
+            return None
+        return outcome_score(outcome, mark)
+
+    # for picking the move with the best exact score, first in cell order on ties
+    def best_move(self, game_state: GameState, mark: Mark) -> Move | None:
+        best_score = float('-inf')
+        best_move = None
+        for index in game_state.possible_cells:
+            move = game_state.make_move_to(index)
+            score = self.score(move.after_state, mark)
+            if score is None:
+                return None
+            if score > best_score:
+                best_score = score
+                best_move = move
+        return best_move
+
+
+def main() -> None:
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PATH
+    save(build(), path)
+    print(f"Tablebase written to {path}")
+
+
+if __name__ == "__main__":
+    main()
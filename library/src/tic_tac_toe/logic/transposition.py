@@ -0,0 +1,51 @@
+import enum
+from collections import OrderedDict
+from typing import Hashable, NamedTuple
+
+DEFAULT_TABLE_SIZE = 100_000
+
+
+# what the stored score says about the true score of the position
+class Bound(enum.Enum):
+    EXACT = "exact"
+    LOWER = "lower"  # the search failed high, the true score is at least this
+    UPPER = "upper"  # the search failed low, the true score is at most this
+
+
+class Entry(NamedTuple):
+    score: float
+    bound: Bound
+
+
+# for remembering searched positions, evicting the least recently used entry
+class TranspositionTable:
+    def __init__(self, max_size: int = DEFAULT_TABLE_SIZE) -> None:
+        if max_size < 1:
+            raise ValueError("Table size must be positive")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, Entry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Entry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return entry
+
+    def store(self, key: Hashable, score: float, bound: Bound) -> None:
+        self._entries[key] = Entry(score, bound)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
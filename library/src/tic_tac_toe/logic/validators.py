@@ -6,12 +6,20 @@ if TYPE_CHECKING:
     from tic_tac_toe.game.players import Player
 
 import re
+from math import isqrt
 from tic_tac_toe.logic.exceptions import InvalidGameState
 
+# the smallest board and the shortest line that can win
+MIN_SIZE = 3
+MIN_WIN_LENGTH = 3
+
 # for error checking to make sure valid data entered on board
 def validate_grid(grid: Grid) -> None:
-    if not re.match(r"^[\sXO]{16}$", grid.cells):
-        raise ValueError("Must contain 16 cells of: X, O, or space")
+    size = isqrt(len(grid.cells))
+    if not re.match(r"^[\sXO]*$", grid.cells) or size * size != len(grid.cells) or size < MIN_SIZE:
+        raise ValueError("Must contain a square number of cells (at least 3x3) of: X, O, or space")
+    if grid.win_length is not None and not MIN_WIN_LENGTH <= grid.win_length <= size:
+        raise ValueError(f"Win length must be between {MIN_WIN_LENGTH} and {size}")
     
 # for validating all aspects of the game
 def validate_game_state(game_state: GameState) -> None:
@@ -0,0 +1,42 @@
+import asyncio
+
+from tic_tac_toe.game.async_engine import AsyncTicTacToe
+from tic_tac_toe.game.async_players import AsyncComputerPlayer, MoveCache
+from tic_tac_toe.game.players import MinimaxComputerPlayer
+from tic_tac_toe.game.selfplay import NullRenderer
+from tic_tac_toe.logic.models import GameState, Grid, Mark
+
+
+def test_cache_keeps_board_sizes_apart():
+    cache = MoveCache()
+    player = AsyncComputerPlayer(MinimaxComputerPlayer, Mark("O"), cache=cache)
+    # the same bitboard on both boards
+    small = GameState(Grid("X        "))
+    large = GameState(Grid("X               "))
+
+    async def play() -> None:
+        assert (await player.get_move(large)).after_state.grid.size == 4
+        assert (await player.get_move(small)).after_state.grid.size == 3
+
+    asyncio.run(play())
+    assert cache.misses == 2
+    assert cache.hits == 0
+
+
+def test_games_of_two_sizes_share_one_cache():
+    cache = MoveCache()
+
+    def game(grid: Grid) -> AsyncTicTacToe:
+        return AsyncTicTacToe(
+            AsyncComputerPlayer(MinimaxComputerPlayer, Mark("X"), cache=cache),
+            AsyncComputerPlayer(MinimaxComputerPlayer, Mark("O"), cache=cache),
+            NullRenderer(),
+            grid=grid,
+        )
+
+    async def play() -> list[GameState]:
+        return await asyncio.gather(game(Grid()).play(), game(Grid.empty_board(3)).play())
+
+    large, small = asyncio.run(play())
+    assert large.game_over and large.grid.size == 4
+    assert small.game_over and small.grid.size == 3
@@ -0,0 +1,12 @@
+from tic_tac_toe.logic.minimax import position_key
+from tic_tac_toe.logic.models import GameState, Grid, Mark
+from tic_tac_toe.logic.search_board import SearchBoard
+
+
+def test_position_key_depends_on_geometry():
+    small = SearchBoard(GameState(Grid("X        ")))
+    large = SearchBoard(GameState(Grid("X               ")))
+    three_in_a_row = SearchBoard(GameState(Grid("X               ", 3)))
+    for symmetric in (False, True):
+        keys = {position_key(board, Mark("O"), True, 2, symmetric) for board in (small, large, three_in_a_row)}
+        assert len(keys) == 3
@@ -0,0 +1,28 @@
+import pytest
+
+from tic_tac_toe.logic.exceptions import InvalidMove
+from tic_tac_toe.logic.models import GameState, Grid
+
+
+@pytest.mark.parametrize("index", [16, 17, -1, -16])
+def test_make_move_to_rejects_cells_off_the_board(index):
+    with pytest.raises(InvalidMove):
+        GameState(Grid()).make_move_to(index)
+
+
+def test_make_move_to_rejects_taken_cells():
+    with pytest.raises(InvalidMove):
+        GameState(Grid("X               ")).make_move_to(0)
+
+
+def test_make_move_to_rejects_moves_after_the_game_is_over():
+    game_state = GameState(Grid("XXXXOOO         "))
+    assert game_state.game_over
+    with pytest.raises(InvalidMove):
+        game_state.make_move_to(15)
+
+
+def test_make_move_to_builds_the_next_state():
+    after_state = GameState(Grid.empty_board(3)).make_move_to(4).after_state
+    assert after_state.grid.cells == "    X    "
+    assert after_state.grid.size == 3
@@ -0,0 +1,39 @@
+from tic_tac_toe.game.players import SabotageComputerPlayer
+from tic_tac_toe.logic.bitboard import DEFAULT_GEOMETRY, BoardGeometry
+from tic_tac_toe.logic.minimax import find_best_move
+from tic_tac_toe.logic.models import GameState, Grid, Mark
+from tic_tac_toe.logic.opening_book import OpeningBook, save
+from tic_tac_toe.logic.symmetry import canonicalize, to_canonical
+
+# X to move, O searching for its own good would not play the book's reply
+POSITION = GameState(Grid("XO              "))
+BOOK_CELL = 15
+
+
+def planted_book() -> OpeningBook:
+    canonical, symmetry = canonicalize(POSITION.grid.bitboard)
+    cell = to_canonical(BOOK_CELL, symmetry)
+    return OpeningBook({(*canonical, False): (cell, cell)})
+
+
+def test_book_answers_for_the_side_to_move_only():
+    book = planted_book()
+    assert book.best_move(POSITION, Mark("X")).cell_index == BOOK_CELL
+    assert book.worst_move(POSITION, Mark("X")).cell_index == BOOK_CELL
+    assert book.best_move(POSITION, Mark("O")) is None
+    assert book.worst_move(POSITION, Mark("O")) is None
+
+
+def test_player_searches_for_the_other_mark(tmp_path):
+    path = tmp_path / "book.bin"
+    save(planted_book(), 2, path)
+    player = SabotageComputerPlayer(Mark("O"), book_path=path)
+    assert player.get_best_move(POSITION).cell_index == find_best_move(POSITION, Mark("O")).cell_index
+
+
+def test_book_answers_for_an_equal_geometry_object():
+    # equal to the default geometry without being the cached instance
+    geometry = BoardGeometry(4, 4)
+    assert geometry == DEFAULT_GEOMETRY and geometry is not DEFAULT_GEOMETRY
+    game_state = GameState(Grid.from_bitboard(POSITION.grid.bitboard, geometry))
+    assert planted_book().best_move(game_state, Mark("X")).cell_index == BOOK_CELL
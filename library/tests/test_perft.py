@@ -0,0 +1,20 @@
+import pytest
+
+from tic_tac_toe.logic.models import GameState, Grid
+from tic_tac_toe.logic.perft import perft
+
+
+# every game of 3x3 tic-tac-toe, X starting
+@pytest.mark.parametrize("table", [None, {}], ids=["plain", "memoized"])
+def test_counts_every_3x3_game(table):
+    counts = perft(GameState(Grid.empty_board(3)), 9, table)
+    assert [ply.positions for ply in counts] == [9, 72, 504, 3024, 15120, 54720, 148176, 200448, 127872]
+    assert sum(ply.x_wins for ply in counts) == 131184
+    assert sum(ply.o_wins for ply in counts) == 77904
+    assert sum(ply.ties for ply in counts) == 46080
+    assert sum(ply.wins + ply.ties for ply in counts) == 255168
+
+
+def test_memoized_counts_match_on_4x4():
+    game_state = GameState(Grid())
+    assert perft(game_state, 3, {}) == perft(game_state, 3)
@@ -0,0 +1,28 @@
+import threading
+
+from tic_tac_toe.game.engine import TicTacToe
+from tic_tac_toe.game.players import MinimaxComputerPlayer, Player
+from tic_tac_toe.game.selfplay import NullRenderer
+from tic_tac_toe.logic.models import GameState, Grid, Mark, Move
+
+# O threatens the top row and the left column, X can only block one, on a
+# board big enough for the pondering to outlast O's reply
+START = Grid("OOO  O X  O   X X  X   X ", 4)
+
+
+# wins straight away when it can, otherwise takes the first empty cell
+class WinningPlayer(Player):
+    def get_move(self, game_state: GameState) -> Move | None:
+        moves = game_state.possible_moves
+        return next((move for move in moves if move.after_state.winner is self.mark), moves[0])
+
+
+def ponder_threads() -> list[threading.Thread]:
+    return [thread for thread in threading.enumerate() if thread.name == "ponder"]
+
+
+def test_ponderer_stops_when_the_opponent_ends_the_game():
+    player = MinimaxComputerPlayer(Mark("X"), book_path=None, ponder=True)
+    game = TicTacToe(player, WinningPlayer(Mark("O")), NullRenderer(), grid=START)
+    game.play(Mark("X"))
+    assert not ponder_threads()
@@ -0,0 +1,73 @@
+import io
+
+import pytest
+
+from tic_tac_toe.game.engine import TicTacToe
+from tic_tac_toe.game.players import RandomComputerPlayer
+from tic_tac_toe.game.records import GameRecord, GameRecordReader, GameRecordWriter, MappedGameRecords, RecordingHooks, replay
+from tic_tac_toe.game.selfplay import NullRenderer
+from tic_tac_toe.logic.models import Grid, Mark
+
+
+def write(records: list[GameRecord], grid: Grid = Grid()) -> bytes:
+    file = io.BytesIO()
+    writer = GameRecordWriter(file, grid)
+    for record in records:
+        writer.write(record)
+    return file.getvalue()
+
+
+@pytest.mark.parametrize("grid", [Grid.empty_board(3), Grid(), Grid.empty_board(5, 4)])
+def test_recorded_games_replay_to_their_final_states(grid, tmp_path):
+    final_states = []
+
+    class Hooks(RecordingHooks):
+        def end_game(self, game_state):
+            final_states.append(game_state)
+            super().end_game(game_state)
+
+    path = tmp_path / "games.bin"
+    with open(path, "wb") as file:
+        hooks = Hooks(GameRecordWriter(file, grid))
+        game = TicTacToe(RandomComputerPlayer(Mark("X")), RandomComputerPlayer(Mark("O")), NullRenderer(), hooks=hooks, grid=grid)
+        for starting_mark in [Mark("X"), Mark("O")] * 10:
+            game.play(starting_mark)
+
+    with open(path, "rb") as file:
+        assert [list(states)[-1] for states in GameRecordReader(file).games()] == final_states
+    records = MappedGameRecords(path)
+    assert [list(states)[-1] for states in records.games()] == final_states
+    records.close()
+
+
+@pytest.mark.parametrize("cells", [
+    (12,),  # off the 3x3 board
+    (4, 4),  # a taken cell
+    (0, 4, 1, 5, 2, 6, 3, 7, 8),  # on after X completed a line
+])
+def test_corrupt_records_raise(cells):
+    grid = Grid.empty_board(3)
+    reader = GameRecordReader(io.BytesIO(write([GameRecord(Mark("X"), cells)], grid)))
+    with pytest.raises(ValueError):
+        for states in reader.games():
+            list(states)
+
+
+def test_corrupt_moves_raise_from_replay():
+    with pytest.raises(ValueError):
+        list(replay(GameRecord(Mark("X"), (0, 16)), Grid()))
+
+
+def test_truncated_files_raise(tmp_path):
+    data = write([GameRecord(Mark("X"), (0, 1, 2))])
+    with pytest.raises(ValueError):
+        list(GameRecordReader(io.BytesIO(data[:-1])))
+    path = tmp_path / "games.bin"
+    path.write_bytes(data[:-1])
+    with pytest.raises(ValueError):
+        list(MappedGameRecords(path))
+
+
+def test_other_files_raise():
+    with pytest.raises(ValueError):
+        GameRecordReader(io.BytesIO(b"TTOB\x02\x04\x00\x00\x00\x00"))
@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+from tic_tac_toe.logic.models import GameState, Grid, Mark
+from tic_tac_toe.logic.search_board import SearchBoard
+
+
+def assert_matches(board: SearchBoard, game_state: GameState) -> None:
+    fresh = SearchBoard(game_state)
+    assert board.bitboard == fresh.bitboard
+    assert board.winner is game_state.winner
+    assert board.game_over == game_state.game_over
+    assert board.current_mark is fresh.current_mark
+    assert board.empty_count == fresh.empty_count
+    assert board.line_codes == fresh.line_codes
+    assert board.line_total == fresh.line_total
+    for mark in Mark:
+        assert board.evaluate_score(mark) == game_state.evaluate_score(mark)
+
+
+# random moves and take-backs, the incremental board must always agree with
+# one built from scratch and with the game state
+@pytest.mark.parametrize("grid", [Grid.empty_board(3), Grid(), Grid.empty_board(4, 3), Grid.empty_board(5, 4)])
+def test_make_and_unmake_match_a_board_built_from_scratch(grid):
+    rng = random.Random(f"search-board:{grid.size}:{grid.win_length}")
+    for _ in range(50):
+        starting_mark = rng.choice(list(Mark))
+        states = [GameState(grid, starting_mark)]
+        board = SearchBoard(states[0])
+        played = []
+        for _ in range(40):
+            game_state = states[-1]
+            if played and (game_state.game_over or rng.random() < 0.3):
+                board.unmake(played.pop())
+                states.pop()
+            else:
+                cell = rng.choice(game_state.possible_cells)
+                board.make(cell)
+                played.append(cell)
+                states.append(game_state.after_move_to(cell))
+            assert_matches(board, states[-1])